@@ -1,8 +1,12 @@
+import logging
 import os
+import time
 from typing import Annotated
 from dotenv import load_dotenv
 from fastapi import Depends
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker , Session
 
 
@@ -12,11 +16,84 @@ from sqlalchemy.orm import declarative_base, relationship, sessionmaker , Sessio
 
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+# Connection budget shared by both engines: the sync engine (ingestion jobs) takes
+# DB_SYNC_POOL_SIZE/DB_SYNC_MAX_OVERFLOW of it and the async engine (requests) the rest
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_SYNC_POOL_SIZE = int(os.getenv("DB_SYNC_POOL_SIZE", "2"))
+DB_SYNC_MAX_OVERFLOW = int(os.getenv("DB_SYNC_MAX_OVERFLOW", "2"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Statements slower than this are logged even with echo off (0 disables)
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
 
-engine = create_engine(DATABASE_URL, echo=True)
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """The async-driver form of a sync URL (postgresql -> asyncpg, sqlite -> aiosqlite)"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend in _ASYNC_DRIVERS and parsed.drivername != _ASYNC_DRIVERS[backend]:
+        parsed = parsed.set(drivername=_ASYNC_DRIVERS[backend])
+    return parsed.render_as_string(hide_password=False)
+
+
+def engine_options(url: str, pool_size: int = DB_POOL_SIZE, max_overflow: int = DB_MAX_OVERFLOW) -> dict:
+    """Pool settings for an engine; SQLite keeps SQLAlchemy's own pool choice"""
+    options = {"echo": DB_ECHO}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+        )
+    return options
+
+
+def log_slow_queries(sync_engine, threshold_ms: float = DB_SLOW_QUERY_MS) -> None:
+    if threshold_ms <= 0:
+        return
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _log_if_slow(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+        if elapsed_ms >= threshold_ms:
+            logger.warning("Slow query (%.1f ms): %s", elapsed_ms, statement, extra={"duration_ms": round(elapsed_ms, 1)})
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _drop_timer(context):
+        # after_cursor_execute does not fire for a failed statement
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, DB_SYNC_POOL_SIZE, DB_SYNC_MAX_OVERFLOW))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+log_slow_queries(engine)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(
+    ASYNC_DATABASE_URL,
+    max(DB_POOL_SIZE - DB_SYNC_POOL_SIZE, 1),
+    max(DB_MAX_OVERFLOW - DB_SYNC_MAX_OVERFLOW, 0),
+))
+# Objects stay usable after commit: responses are built from them once the session is gone
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+log_slow_queries(async_engine.sync_engine)
 
 Base = declarative_base()
 
@@ -26,6 +103,14 @@ def get_db():
         yield db
     finally:
         db.close()
-        
 
-DbSession = Annotated[Session, Depends(get_db)]
\ No newline at end of file
+
+DbSession = Annotated[Session, Depends(get_db)]
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_db)]
@@ -0,0 +1,53 @@
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordBearer
+
+from .database import AsyncSessionLocal
+from .metrics import stage
+from ..repositories.user_repository import AsyncUserRepository
+from ..schemas.User_schema import AuthenticatedUser
+from ..services.jwt_service import JwtService
+from ..utils.user_cache import user_cache
+
+# Kept as a dependency so the OpenAPI docs still offer the "Authorize" flow
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="authentication/login")
+
+_jwt_service = JwtService()
+
+
+async def load_user(email: str) -> AuthenticatedUser | None:
+    """User for an email, from the user cache or the database"""
+    user = user_cache.get(email)
+    if user is not None:
+        return user
+    async with AsyncSessionLocal() as db:
+        row = await AsyncUserRepository(db).get_user_by_email(email=email)
+        if row is None:
+            return None
+        user = AuthenticatedUser.model_validate(row)
+    user_cache.set(email, user)
+    return user
+
+
+async def get_current_user(request: Request, token: Annotated[str, Depends(oauth2_scheme)]) -> AuthenticatedUser:
+    """User behind the bearer token.
+
+    AuthMiddleware already verified the token and left its payload in
+    ``request.state.principal``; it is only decoded here when the middleware
+    did not run. A cache miss opens an async session only for that lookup.
+    """
+    payload = getattr(request.state, "principal", None)
+    if payload is None:
+        payload = _jwt_service.decode_jwt(token)
+    email = payload.get("sub")
+    if email is None:
+        raise HTTPException(status_code=401, detail="email not in payload")
+    with stage("auth_user"):
+        user = await load_user(email)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Not Found the user with this email")
+    return user
+
+
+CurrentUser = Annotated[AuthenticatedUser, Depends(get_current_user)]
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
+
+from ..services.llm_client import get_chat_model
+from ..utils.context_builder import context_builder
+from ..utils.document_processing_service import DocumentProcessingService
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# false: skip the warm-up, the model then loads on the first request that embeds
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+
+
+class Readiness:
+    """Whether the process has finished warming up and should receive traffic."""
+
+    def __init__(self):
+        self.ready = False
+        self.error: str | None = None
+        self.warmup_seconds: float | None = None
+        self._lock = threading.Lock()
+
+    def mark_ready(self, warmup_seconds: float | None = None) -> None:
+        with self._lock:
+            self.ready = True
+            self.error = None
+            self.warmup_seconds = warmup_seconds
+
+    def mark_failed(self, error: str) -> None:
+        with self._lock:
+            self.ready = False
+            self.error = error
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "error": self.error,
+                "warmup_seconds": round(self.warmup_seconds, 3) if self.warmup_seconds is not None else None,
+                "embedding_model_loaded": DocumentProcessingService.embedding_provider.loaded,
+            }
+
+
+readiness = Readiness()
+
+
+def warm_up() -> None:
+    """Load the embedding model, run one encode, load the token encoding and build the chat model client."""
+    started = time.perf_counter()
+    try:
+        DocumentProcessingService.embedding_provider.warm_up()
+        # tiktoken downloads its BPE file on first use; count once so the first /ask does not
+        context_builder.count_tokens("warm up")
+        get_chat_model()
+    except Exception as e:
+        logger.exception("Warm-up failed")
+        readiness.mark_failed(str(e))
+        return
+    readiness.mark_ready(time.perf_counter() - started)
+    logger.info("Warm-up finished in %.2fs", readiness.warmup_seconds)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Start serving at once and warm up in a thread; /health/ready turns 200 when done."""
+    warmup_task = None
+    if WARMUP_ON_STARTUP:
+        warmup_task = asyncio.create_task(asyncio.to_thread(warm_up))
+    else:
+        readiness.mark_ready()
+    try:
+        yield
+    finally:
+        if warmup_task is not None and not warmup_task.done():
+            await asyncio.wait([warmup_task])
+        DocumentProcessingService.parsing_pool.shutdown()
@@ -0,0 +1,187 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+
+class Histogram:
+    """Thread-safe cumulative histogram with fixed bucket upper bounds."""
+
+    def __init__(self, name: str, description: str, buckets: list[float], labels: dict | None = None):
+        self.name = name
+        self.description = description
+        self.buckets = sorted(buckets)
+        self.labels = labels or {}
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative, running = {}, 0
+            for bound, count in zip(self.buckets + [float("inf")], self._counts):
+                running += count
+                cumulative["+Inf" if bound == float("inf") else bound] = running
+            return {
+                "buckets": cumulative,
+                "count": self._count,
+                "sum": self._sum,
+                "mean": self._sum / self._count if self._count else 0.0,
+            }
+
+    def render(self) -> list[str]:
+        snapshot = self.snapshot()
+        lines = [
+            f"{self.name}_bucket{_format_labels({**self.labels, 'le': bound})} {count}"
+            for bound, count in snapshot["buckets"].items()
+        ]
+        lines.append(f"{self.name}_sum{_format_labels(self.labels)} {snapshot['sum']}")
+        lines.append(f"{self.name}_count{_format_labels(self.labels)} {snapshot['count']}")
+        return lines
+
+
+class Counter:
+    """Thread-safe monotonically increasing counter."""
+
+    def __init__(self, name: str, description: str, labels: dict | None = None):
+        self.name = name
+        self.description = description
+        self.labels = labels or {}
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def render(self) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labels)} {self.value}"]
+
+
+class Gauge:
+    """Value read from a callback at scrape time (e.g. a cache's current size)."""
+
+    def __init__(self, name: str, description: str, read: Callable[[], float], labels: dict | None = None):
+        self.name = name
+        self.description = description
+        self.read = read
+        self.labels = labels or {}
+
+    def render(self) -> list[str]:
+        try:
+            value = float(self.read())
+        except Exception:
+            return []
+        return [f"{self.name}{_format_labels(self.labels)} {value}"]
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+class MetricsRegistry:
+    """Named metrics of the process, rendered in the Prometheus text format.
+
+    Metrics are keyed by (name, labels), so ``histogram("stage_seconds", ...,
+    labels={"stage": "llm"})`` returns the same series on every call.
+    """
+
+    _TYPES = {Histogram: "histogram", Counter: "counter", Gauge: "gauge"}
+
+    def __init__(self):
+        self._metrics: dict[tuple, Histogram | Counter | Gauge] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: dict | None) -> tuple:
+        return name, tuple(sorted((labels or {}).items()))
+
+    def register(self, metric):
+        """Add an existing metric (e.g. a histogram owned by a component); returns it."""
+        with self._lock:
+            return self._metrics.setdefault(self._key(metric.name, metric.labels), metric)
+
+    def histogram(self, name: str, description: str, buckets: list[float], labels: dict | None = None) -> Histogram:
+        metric = self._metrics.get(self._key(name, labels))
+        return metric if metric is not None else self.register(Histogram(name, description, buckets, labels))
+
+    def counter(self, name: str, description: str, labels: dict | None = None) -> Counter:
+        metric = self._metrics.get(self._key(name, labels))
+        return metric if metric is not None else self.register(Counter(name, description, labels))
+
+    def gauge(self, name: str, description: str, read: Callable[[], float], labels: dict | None = None) -> Gauge:
+        with self._lock:
+            gauge = Gauge(name, description, read, labels)
+            self._metrics[self._key(name, labels)] = gauge
+            return gauge
+
+    def gauges_from_stats(self, prefix: str, description: str, stats: Callable[[], dict]) -> None:
+        """One gauge per numeric field of a component's ``stats()`` dict"""
+        for field, value in stats().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.gauge(f"{prefix}_{field}", f"{description}: {field}",
+                           lambda field=field: stats()[field])
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines, described = [], set()
+        for metric in metrics:
+            if metric.name not in described:
+                described.add(metric.name)
+                lines.append(f"# HELP {metric.name} {metric.description}")
+                lines.append(f"# TYPE {metric.name} {self._TYPES[type(metric)]}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+
+# (stage, seconds) pairs of the current request; None outside a timed request
+_request_timings: contextvars.ContextVar[list | None] = contextvars.ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> list:
+    """Start collecting stage timings for the current request; returns the live list."""
+    timings: list[tuple[str, float]] = []
+    _request_timings.set(timings)
+    return timings
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage into ``pipeline_stage_seconds{stage=name}``.
+
+    Within a request the duration is also added to its Server-Timing header.
+    Threadpool calls inherit the request context, so stages timed there count too.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.histogram(
+            "pipeline_stage_seconds", "Duration of ingestion and RAG pipeline stages",
+            STAGE_BUCKETS, labels={"stage": name},
+        ).observe(elapsed)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((name, elapsed))
@@ -1,9 +1,12 @@
+import time
+
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 from ..services.jwt_service import JwtService
+from .metrics import registry, stage, start_request_timings, STAGE_BUCKETS
 
-PUBLIC_PATHS = [
+# Exact paths served without a token
+PUBLIC_PATHS = frozenset({
     "/",
     "/authentication/login",
     "/authentication/register",
@@ -11,20 +14,43 @@ PUBLIC_PATHS = [
     "/docs",
     "/docs/oauth2-redirect",  # Swagger redirect
     "/redoc",
-]
+    "/metrics",
+    "/health/live",
+    "/health/ready",
+})
+# Path prefixes served without a token (str.startswith accepts the tuple in one call)
+PUBLIC_PATH_PREFIXES = ("/docs/",)
 
 _jwt_service = JwtService()
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    
-    async def dispatch(self, request, call_next):
-        # Skip authentication for public paths
-        if request.url.path in PUBLIC_PATHS:
-            print("Public path accessed:", request.url.path)
-            return await call_next(request)
+
+class AuthMiddleware:
+    """Pure ASGI bearer-token check.
+
+    Unlike BaseHTTPMiddleware, this does not wrap the request and response
+    streams or spawn a task per request: public and non-HTTP traffic is handed
+    straight to the app, and protected requests only cost a header lookup and
+    one JWT decode. The decoded payload is left in ``scope["state"]``, where
+    ``request.state.principal`` reads it.
+    """
+
+    def __init__(self, app, public_paths: frozenset = PUBLIC_PATHS,
+                 public_prefixes: tuple = PUBLIC_PATH_PREFIXES):
+        self.app = app
+        self.public_paths = public_paths
+        self.public_prefixes = public_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.is_public(scope["path"]):
+            await self.app(scope, receive, send)
+            return
 
         try:
-            token = request.headers.get("Authorization")
+            token = None
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    token = value.decode("latin-1")
+                    break
             if not token or not token.startswith("Bearer "):
                 raise HTTPException(
                     status_code=401,
@@ -32,10 +58,99 @@ class AuthMiddleware(BaseHTTPMiddleware):
                     headers={"WWW-Authenticate": "Bearer"},
                 )
             token = token.split(" ")[1]  # Extract the token part
-            _jwt_service.decode_jwt(token)
+            # Decoded once here; routes read the principal through get_current_user
+            with stage("auth_jwt"):
+                principal = _jwt_service.decode_jwt(token)
         except HTTPException as e:
-            return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
-        
-        return await call_next(request)
-        
-        
\ No newline at end of file
+            response = JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+            await response(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["principal"] = principal
+        await self.app(scope, receive, send)
+
+    def is_public(self, path: str) -> bool:
+        return path in self.public_paths or path.startswith(self.public_prefixes)
+
+
+class ServerTimingMiddleware:
+    """Per-request stage breakdown in a ``Server-Timing`` header, plus request latency metrics.
+
+    Stages timed with ``metrics.stage`` while the request runs (auth, retrieval,
+    context building, LLM...) are listed with a final ``total``. Streaming
+    responses only list the stages finished before their headers went out.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timings = start_request_timings()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings]
+                entries.append(f"total;dur={(time.perf_counter() - started) * 1000:.1f}")
+                message["headers"] = [*message.get("headers", []), (b"server-timing", ", ".join(entries).encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # Route templates (not raw paths) keep the label set bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            registry.histogram(
+                "http_request_duration_seconds", "HTTP request latency", STAGE_BUCKETS,
+                labels={"method": scope["method"], "route": route, "status": str(status_code)},
+            ).observe(time.perf_counter() - started)
+
+
+class BodySizeLimitMiddleware:
+    """Rejects request bodies above a per-path limit with 413 before they are parsed.
+
+    A declared Content-Length above the limit is refused without reading the
+    body. Otherwise the body stream is counted as the app consumes it, so a
+    chunked or lying client is cut off once it goes over, instead of the
+    multipart parser spooling the whole upload to disk first.
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body too large. Maximum size is {limit} bytes."
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > limit:
+                    response = JSONResponse(status_code=413, content={"detail": detail})
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Re-raised by FastAPI's body parsing and turned into the response
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON
+from ..core.database import Base
+
+
+class IngestionJobRecord(Base):
+    __tablename__ = 'ingestion_jobs'
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
+    filename = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    stage = Column(String, nullable=False)
+    progress = Column(Float, nullable=False, default=0.0)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    stage_timings = Column(JSON, nullable=False, default=dict)
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from ..models.IngestionJob import IngestionJobRecord
+
+
+class IngestionJobRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def save(self, record: IngestionJobRecord) -> IngestionJobRecord:
+        record = self.db.merge(record)
+        self.db.commit()
+        return record
+
+    def get_job_by_id(self, job_id: str) -> IngestionJobRecord | None:
+        return self.db.get(IngestionJobRecord, job_id)
+
+    def delete_finished_before(self, cutoff: datetime) -> int:
+        deleted = (
+            self.db.query(IngestionJobRecord)
+            .filter(IngestionJobRecord.finished_at.is_not(None), IngestionJobRecord.finished_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted
@@ -1,5 +1,7 @@
 from ..models.Resume import Resume
 from ..models.User import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 class ResumeRepository:
@@ -40,4 +42,46 @@ class ResumeRepository:
         
         self.db.commit()
         self.db.refresh(resume)
-        return resume
\ No newline at end of file
+        return resume
+
+
+class AsyncResumeRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_resume(self, resume: Resume) -> Resume:
+        self.db.add(resume)
+        await self.db.commit()
+        await self.db.refresh(resume)
+        return resume
+
+    async def get_resume_by_id(self, resume_id: int) -> Resume | None:
+        return await self.db.get(Resume, resume_id)
+
+    async def get_all_resumes(self) -> list[Resume]:
+        result = await self.db.execute(select(Resume))
+        return list(result.scalars().all())
+
+    async def get_resumes_by_user_id(self, user_id: int) -> list[Resume]:
+        result = await self.db.execute(select(Resume).where(Resume.user_id == user_id))
+        return list(result.scalars().all())
+
+    async def delete_resume(self, resume_id: int) -> None:
+        resume = await self.get_resume_by_id(resume_id)
+        if resume:
+            await self.db.delete(resume)
+            await self.db.commit()
+        else:
+            raise ValueError("Resume not found")
+
+    async def update_resume(self, resume_id: int, updated_data: dict) -> Resume:
+        resume = await self.get_resume_by_id(resume_id)
+        if not resume:
+            raise ValueError("Resume not found")
+
+        for key, value in updated_data.items():
+            setattr(resume, key, value)
+
+        await self.db.commit()
+        await self.db.refresh(resume)
+        return resume
@@ -1,6 +1,8 @@
 # from ..schemas.User_schema import UserCreate
 from ..models.User import User
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 class UserRepository:
@@ -18,4 +20,23 @@ class UserRepository:
         return self.db.query(User).filter(User.email == email).first()
 
     def get_all_users(self):
-        return self.db.query(User).all()
\ No newline at end of file
+        return self.db.query(User).all()
+
+
+class AsyncUserRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_user(self, user: User) -> User:
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        result = await self.db.execute(select(User).where(User.email == email).limit(1))
+        return result.scalars().first()
+
+    async def get_all_users(self) -> list[User]:
+        result = await self.db.execute(select(User))
+        return list(result.scalars().all())
@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends ,HTTPException
 from typing import Annotated
 from ..services.authentication_service import authenticationService
 from sqlalchemy.orm import Session
-from ..core.database import DbSession
+from ..core.database import AsyncDbSession
 from ..schemas.User_schema import UserCreate 
 from fastapi.security import OAuth2PasswordRequestForm
 from ..schemas.Token_schema import Token
@@ -23,10 +23,10 @@ class AuthenticationRouter:
 
     def setup_routes(self):
         @self.router.post("/login")
-        async def login( db: DbSession  ,
+        async def login( db: AsyncDbSession  ,
                         form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
                         ):
-            user = self.authentication_service.authenticate_user(db,form_data.username, form_data.password)
+            user = await self.authentication_service.aauthenticate_user(db, form_data.username, form_data.password)
             if not user:
                 raise HTTPException(
                     status_code=400,
@@ -38,8 +38,8 @@ class AuthenticationRouter:
             return token
 
         @self.router.post("/register")
-        async def register( db: DbSession ,user: UserCreate = Depends(UserCreate),):
-            self.authentication_service.create_user(db,user)
+        async def register( db: AsyncDbSession ,user: UserCreate = Depends(UserCreate),):
+            await self.authentication_service.acreate_user(db, user)
             return {"message": "User registered successfully"}
         
         # Todos : /user/profile 
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from ..core.lifecycle import readiness
+
+
+class HealthRouter:
+    def __init__(self):
+        self.router = APIRouter(prefix="/health", tags=["Health"])
+        self.setup_routes()
+
+    def setup_routes(self):
+        @self.router.get("/live")
+        async def live():
+            """
+            The process is up and serving requests (it may still be warming up)
+            """
+            return {"status": "alive"}
+
+        @self.router.get("/ready")
+        async def ready():
+            """
+            200 once the warm-up has finished, 503 before that or if it failed
+            """
+            state = readiness.to_dict()
+            return JSONResponse(
+                status_code=status.HTTP_200_OK if state["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+                content=state,
+            )
+
+
+health_router = HealthRouter().router
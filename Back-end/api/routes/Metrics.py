@@ -0,0 +1,50 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..core.metrics import registry
+from ..services.password_hasher import password_hasher
+from ..utils.batching_embeddings import BatchingEmbeddings
+from ..utils.document_processing_service import DocumentProcessingService
+from ..utils.response_cache import response_cache
+from ..utils.semantic_cache import semantic_cache
+from ..utils.user_cache import user_cache
+
+
+class MetricsRouter:
+    def __init__(self):
+        self.router = APIRouter(tags=["Metrics"])
+        self.register_component_metrics()
+        self.setup_routes()
+
+    def register_component_metrics(self):
+        """Expose the caches and pools that already keep their own statistics"""
+        registry.gauges_from_stats("response_cache", "Resume service answer cache", response_cache.stats)
+        registry.gauges_from_stats("semantic_cache", "Semantic answer cache", semantic_cache.stats)
+        registry.gauges_from_stats("user_cache", "Authenticated user cache", user_cache.stats)
+        registry.gauges_from_stats("vector_store_cache", "Open vector store cache",
+                                   DocumentProcessingService.vector_store_cache.stats)
+        registry.gauges_from_stats("embedding_cache", "Embedding cache", DocumentProcessingService.embeddings.stats)
+
+        registry.gauge("password_hash_in_flight", "bcrypt jobs running or queued",
+                       lambda: password_hasher.stats()["in_flight"])
+        registry.gauge("password_hash_rejected", "bcrypt jobs rejected with 503",
+                       lambda: password_hasher.rejected)
+        for histogram in (password_hasher.hash_histogram, password_hasher.verify_histogram,
+                          password_hasher.queue_wait_histogram):
+            registry.register(histogram)
+
+        base_embeddings = DocumentProcessingService.base_embeddings
+        if isinstance(base_embeddings, BatchingEmbeddings):
+            registry.register(base_embeddings.batch_size_histogram)
+            registry.register(base_embeddings.queue_wait_histogram)
+
+    def setup_routes(self):
+        @self.router.get("/metrics", response_class=PlainTextResponse)
+        def metrics():
+            """
+            Process metrics in the Prometheus text exposition format
+            """
+            return PlainTextResponse(registry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+metrics_router = MetricsRouter().router
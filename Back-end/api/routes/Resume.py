@@ -1,67 +1,78 @@
-from fastapi import APIRouter, status, Depends, HTTPException, UploadFile, File
-from fastapi.security import OAuth2PasswordBearer
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.schema import AIMessage, HumanMessage, SystemMessage 
+from fastapi import APIRouter, status, Depends, HTTPException, UploadFile, File, Request
+from fastapi.responses import StreamingResponse
 from typing import Annotated
+from contextlib import aclosing
+import time
 from ..services.resume_service import ResumeService
 from ..services.rag_service import RAGService
-from ..services.jwt_service import JwtService
-from ..core.database import DbSession
+from ..services.ingestion_job_service import IngestionJobService
+from ..core.dependencies import CurrentUser
 import os
 from ..utils.document_processing_service import DocumentProcessingService
-from pprint import pprint
+from ..utils.sse import format_sse, SSE_HEADERS
+import logging
 
 from dotenv import load_dotenv
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 class resumeRouter:
+    VALID_SERVICES = ["answer_question", "rate_resume", "suggest_improvements", "analyze_skills"]
+
     def __init__(self):
         self.router = APIRouter(prefix="/resume", tags=["Resume"])
         self.resumeService = ResumeService()
         self.RAGService = RAGService()
+        self.ingestionJobService = IngestionJobService(self.resumeService)
         self.setup_routes()
 
     def setup_routes(self):
 
-        @self.router.post("/upload", status_code=status.HTTP_201_CREATED)
+        @self.router.post("/upload", status_code=status.HTTP_202_ACCEPTED)
         def upload_resume(
-            token: Annotated[str, Depends(OAuth2PasswordBearer(tokenUrl="authentication/login"))],
-            db: DbSession,
+            user: CurrentUser,
             file: UploadFile = File(...)
         ):
-            allowed_extensions = ['.pdf', '.docx', '.html']
-            file_extension = os.path.splitext(file.filename)[1].lower()
-            if file_extension not in allowed_extensions:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Unsupported file type. Only PDF, DOCX, and HTML files are allowed."
-                )
-
-            jwt_service = JwtService()
-            user = jwt_service.get_current_user(db, token)
             user_id = user.id
 
             # Save file
-            file_path = self.resumeService.save_file(user_id, file)
+            saved = self.resumeService.save_file(user_id, file)
 
             try:
-                # Process the resume (load document, add metadata, save in DB )
-                self.resumeService.process_resume(db, file_path, user_id)
-
-            finally:
-                # remoce the temporary file
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-
-            return {"message": f"Resume uploaded successfully, file name: {file.filename}"}
+                # Process the resume in the background (load, split, embed, store);
+                # the job removes the temporary file once done
+                job = self.ingestionJobService.submit(user_id, saved.path, file.filename, saved.sha256)
+            except Exception:
+                if os.path.exists(saved.path):
+                    os.remove(saved.path)
+                raise
+
+            return {
+                "message": f"Resume uploaded successfully, file name: {file.filename}",
+                "job_id": job.id,
+                "status_url": f"/resume/jobs/{job.id}",
+            }
+
+        @self.router.get("/jobs/{job_id}")
+        def get_ingestion_job(
+            job_id: str,
+            user: CurrentUser,
+        ):
+            """
+            Report the stage, progress and timings of a resume ingestion job
+            """
+            job = self.ingestionJobService.get(job_id)
+            if job is None or job.user_id != user.id:
+                raise HTTPException(status_code=404, detail="Job not found")
+            return job.to_dict()
 
     
                 
         @self.router.get("/ask")
-        def ask_resume(
-            token: Annotated[str, Depends(OAuth2PasswordBearer(tokenUrl="authentication/login"))],
-            db: DbSession,
+        async def ask_resume(
+            user: CurrentUser,
             question: str   # Default question for testing
             
         ):
@@ -74,40 +85,45 @@ class resumeRouter:
             RAG-based endpoint: Ask questions about the user's resume
             """
             try:
-                # 1. Authenticate
-                jwt_service = JwtService()
-                user = jwt_service.get_current_user(db, token)
+                # 1. Authenticated by the CurrentUser dependency
                 user_id = user.id
 
-                # 2. Load user's vector DB
-                vector_store = DocumentProcessingService.get_vector_store(f"resume_{user_id}")
+                context_tokens = 0
+
+                async def produce():
+                    nonlocal context_tokens
+                    # 2-4. Retrieve candidate chunks and pack the relevant ones into the token budget
+                    packed = await self.RAGService.aretrieve_packed_context(user_id, question)
+                    logger.debug("Packed %d of %d retrieved documents (%d tokens)",
+                                 len(packed.chunks), packed.candidates, packed.tokens)
 
-                # 3. Retrieve relevant resume chunks
-                relevant_docs = vector_store.similarity_search(question, k=3)
-                print(f"Retrieved {len(relevant_docs)} relevant documents")
+                    if not packed.chunks:
+                        return None
 
+                    context_tokens = packed.tokens
+                    
+                    return await self.RAGService.aask_model_with_question(context = packed.text , question = question) 
 
-                if not relevant_docs:
+                # 5. Call model, unless a near-identical question was already answered
+                answer = await self.RAGService.asemantic_cached_answer(user_id, question, produce)
+                if answer is None:
                     return {
                         "status": "error",
                         "message": "No relevant resume documents found",
                         "user_id": user_id
                     }
 
-                # 4. Construct RAG prompt
-                context = "\n\n".join([doc.page_content for doc in relevant_docs])
-                print(f"Context length: {context} characters")
-                
-                response = self.RAGService.ask_model_with_question(context = context , question = question) 
-                # print(f"Model response: {response.content}")
-
                 return {
                     "status": "success",
                     "user_id": user_id,
                     "question": question,
-                    "answer": response.content,
+                    "answer": answer,
+                    "context_tokens": context_tokens,
                 }
 
+            except HTTPException:
+                raise
+
             except Exception as e:
                 return {
                     "status": "error",
@@ -115,41 +131,33 @@ class resumeRouter:
                 }
 
         @self.router.get("/rate")
-        def rate_resume(
-            token: Annotated[str, Depends(OAuth2PasswordBearer(tokenUrl="authentication/login"))],
-            db: DbSession,
+        async def rate_resume(
+            user: CurrentUser,
         ):
             """
             Rate the user's resume using AI based on all available resume content.
             """
             
             try:
-                # 1. Authenticate user
-                print(f"\n=== RATING RESUME ===")
-                jwt_service = JwtService()
-                user = jwt_service.get_current_user(db , token)
                 user_id = user.id
 
-                # 2. Load the vector store
-                vector_store = DocumentProcessingService.get_vector_store(f"resume_{user_id}")
-
-                # 3. Retrieve relevant documents (whole resume or top-k)
-                resume_docs = vector_store.similarity_search("Rate this resume", k=15)
-                if not resume_docs:
-                    raise HTTPException(status_code=404, detail="No resume content found for rating")
+                async def produce():
+                    # 2-4. Fetch the whole resume in document order, overlaps removed
+                    resume_docs, context = await self.RAGService.aget_resume_context(user_id)
+                    if not resume_docs:
+                        raise HTTPException(status_code=404, detail="No resume content found for rating")
 
-                # 4. Combine context from documents
-                context = "\n\n".join([doc.page_content for doc in resume_docs])
-                print(f"Resume context length: {len(context)} characters")
+                    # 5. Ask model using RAGService
+                    return await self.RAGService.aask_model(context=context, service_type="rate_resume")
 
-                # 5. Ask model using RAGService
-                response = self.RAGService.ask_model(context=context, service_type="rate_resume")
+                # Same resume, same prompt: reuse the previous rating
+                answer = await self.RAGService.acached_service_response(user_id, "rate_resume", produce)
 
                 return {
                     "status": "success",
                     "user_id": user_id,
                     "service": "rate_resume",
-                    "answer": response.content if hasattr(response, "content") else response,
+                    "answer": answer,
                 }
 
             except HTTPException as http_err:
@@ -162,10 +170,9 @@ class resumeRouter:
                 }
                 
         @self.router.get("/service/{service_type}/pipeline")
-        def resume_service_pipeline(
+        async def resume_service_pipeline(
                 service_type: str,
-                token: Annotated[str, Depends(OAuth2PasswordBearer(tokenUrl="authentication/login"))],
-                db: DbSession,
+                user: CurrentUser,
                 question: str = None
             ):
                 """
@@ -174,7 +181,7 @@ class resumeRouter:
                 
                 
                 # Validate service type
-                valid_services = ["answer_question", "rate_resume", "suggest_improvements", "analyze_skills"]
+                valid_services = self.VALID_SERVICES
                 if service_type not in valid_services:
                     raise HTTPException(
                         status_code=400,
@@ -189,30 +196,29 @@ class resumeRouter:
                     )
                 
                 try:
-                    # Authenticate
-                    jwt_service = JwtService()
-                    user = jwt_service.get_current_user(db, token)
                     user_id = user.id
                     
-                    print(f"\n=== PIPELINE SERVICE: {service_type.upper()} ===")
-                    print(f"User ID: {user_id}")
+                    logger.debug("Pipeline service %s", service_type, extra={"user_id": user_id})
 
                     # Use RAGService complete pipeline
                     if service_type == "answer_question":
-                        response = self.RAGService.get_response(
+                        response = await self.RAGService.aget_response(
                             question=question,
-                            service_type=service_type
+                            service_type=service_type,
+                            user_id=user_id
                         )
                     else:
                         # For non-question services, use a generic query
                         generic_query = f"Analyze resume for {service_type}"
-                        print(f"Using generic query: {generic_query}")
-                        response = self.RAGService.get_response(
-                            question=f"Analyze resume for {service_type}",
-                            service_type=service_type,
-                            k=15
+                        response = await self.RAGService.acached_service_response(
+                            user_id,
+                            service_type,
+                            lambda: self.RAGService.aget_response(
+                                question=generic_query,
+                                service_type=service_type,
+                                user_id=user_id
+                            )
                         )
-                        return response
 
                     return {
                         "status": "success",
@@ -223,6 +229,8 @@ class resumeRouter:
                         "method": "pipeline"
                     }
 
+                except HTTPException:
+                    raise
                 except ValueError as e:
                     return {
                         "status": "error",
@@ -237,6 +245,111 @@ class resumeRouter:
                         "service_type": service_type
                     }
 
+        @self.router.get("/ask/stream")
+        async def ask_resume_stream(
+            request: Request,
+            user: CurrentUser,
+            question: str
+        ):
+            """
+            Streaming variant of /ask: answer tokens are pushed as Server-Sent Events
+            """
+            packed = await self.RAGService.aretrieve_packed_context(user.id, question)
+            if not packed.chunks:
+                raise HTTPException(status_code=404, detail="No relevant resume documents found")
+            return self._stream_answer(request, packed.chunks, "answer_question", question,
+                                       context=packed.text, context_tokens=packed.tokens)
+
+        @self.router.get("/rate/stream")
+        async def rate_resume_stream(
+            request: Request,
+            user: CurrentUser,
+        ):
+            """
+            Streaming variant of /rate
+            """
+            resume_docs, context = await self.RAGService.aget_resume_context(user.id)
+            if not resume_docs:
+                raise HTTPException(status_code=404, detail="No resume content found for rating")
+            return self._stream_answer(request, resume_docs, "rate_resume", context=context)
+
+        @self.router.get("/service/{service_type}/pipeline/stream")
+        async def resume_service_pipeline_stream(
+            request: Request,
+            service_type: str,
+            user: CurrentUser,
+            question: str = None
+        ):
+            """
+            Streaming variant of /service/{service_type}/pipeline
+            """
+            if service_type not in self.VALID_SERVICES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid service type. Valid options: {', '.join(self.VALID_SERVICES)}"
+                )
+            if service_type == "answer_question" and not question:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Question parameter is required for 'answer_question' service"
+                )
+
+            context_tokens = None
+            if service_type == "answer_question":
+                packed = await self.RAGService.aretrieve_packed_context(user.id, question)
+                docs, context, context_tokens = packed.chunks, packed.text, packed.tokens
+            else:
+                docs, context = await self.RAGService.aget_resume_context(user.id)
+                question = None
+            if not docs:
+                raise HTTPException(status_code=404, detail="No resume content found, upload a resume first")
+            return self._stream_answer(request, docs, service_type, question,
+                                       context=context, context_tokens=context_tokens)
+
+    def _stream_answer(self, request: Request, docs, service_type: str, question: str | None = None,
+                       context: str | None = None, context_tokens: int | None = None) -> StreamingResponse:
+        """
+        SSE stream: a `sources` event, one `token` event per model chunk, then `done`
+        (usage + timings) or `error`. A client disconnect closes the model stream.
+        """
+        if context is None:
+            context = "\n\n".join([doc.page_content for doc in docs])
+        sources = [
+            {"source": doc.metadata.get("source"), "page": doc.metadata.get("page"), "preview": doc.page_content[:200]}
+            for doc in docs
+        ]
+
+        async def events():
+            started = time.perf_counter()
+            first_token_at = None
+            message = None
+            yield format_sse("sources", {"service_type": service_type, "sources": sources})
+            try:
+                async with aclosing(self.RAGService.stream_model(context, service_type, question)) as stream:
+                    async for chunk in stream:
+                        if await request.is_disconnected():
+                            return
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        message = chunk if message is None else message + chunk
+                        if chunk.content:
+                            yield format_sse("token", {"text": chunk.content})
+            except Exception as e:
+                yield format_sse("error", {"message": f"Failed to process {service_type}: {str(e)}"})
+                return
+
+            finished = time.perf_counter()
+            yield format_sse("done", {
+                "usage": getattr(message, "usage_metadata", None),
+                "context_tokens": context_tokens,
+                "timing": {
+                    "time_to_first_token_ms": round((first_token_at - started) * 1000, 1) if first_token_at else None,
+                    "total_ms": round((finished - started) * 1000, 1),
+                },
+            })
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
             
 resume_router = resumeRouter().router
 
@@ -26,4 +26,14 @@ class userLogin(BaseModel):
     
 
 class UserInDB(User):
-    hashed_password: str
\ No newline at end of file
+    hashed_password: str
+
+class AuthenticatedUser(BaseModel):
+    """The user behind a request's bearer token, as cached between requests"""
+    id: int
+    username: str | None = None
+    email: str
+    full_name: str | None = None
+    disabled: bool | None = None
+    class Config:
+        from_attributes = True
@@ -1,20 +1,21 @@
-
-
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends , HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..repositories.user_repository import UserRepository
+from ..repositories.user_repository import UserRepository, AsyncUserRepository
 from ..schemas.User_schema import UserCreate , UserInDB , User as UserSchema
 from ..models.User import User
+from ..utils.user_cache import user_cache
+from .password_hasher import password_hasher
 
 
 class authenticationService:
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.password_hasher = password_hasher
+        self.pwd_context = password_hasher.pwd_context
         self.oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/authentication/login")
-    
-    
+
+
     def authenticate_user(self, db: Session, email: str, password: str) -> UserInDB | None:
         user = self.get_user(db,email)
         if not user :
@@ -22,8 +23,15 @@ class authenticationService:
         if not self.verify_password(password, user.hashed_password):
             return None
         return user
-        
-        
+
+    async def aauthenticate_user(self, db: AsyncSession, email: str, password: str) -> UserInDB | None:
+        """Async authenticate_user: async DB lookup, bcrypt on the hashing pool"""
+        user = await self.aget_user(db, email)
+        if not user :
+            return None
+        if not await self.password_hasher.verify(password, user.hashed_password):
+            return None
+        return user
 
     def create_user(self, db: Session, user: UserCreate):
         new_user = User(**user.model_dump(exclude={"password"}))
@@ -34,22 +42,46 @@ class authenticationService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
+        return self._save_user(db, new_user)
+
+    async def acreate_user(self, db: AsyncSession, user: UserCreate):
+        """Async create_user; a duplicate email is rejected before any hashing work"""
+        if await self.aget_user(db, user.email) is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered",
+            )
+        new_user = User(**user.model_dump(exclude={"password"}))
+        new_user.hashed_password = await self.password_hasher.hash(user.password.get_secret_value())
+        created_user = await AsyncUserRepository(db).create_user(new_user)
+        user_cache.invalidate(created_user.email)
+        return UserSchema.model_validate(created_user)
+
+    def _save_user(self, db: Session, new_user: User):
         user_repository = UserRepository(db)
         created_user = user_repository.create_user(new_user)
+        user_cache.invalidate(created_user.email)
 
         # Conversion ORM → Pydantic
         return UserSchema.model_validate(created_user)
 
     def get_password_hash(self,password):
-        return self.pwd_context.hash(password)
-    
+        return self.password_hasher.hash_sync(password)
+
     def get_user(self,db: Session ,email: str ):
         user_repository = UserRepository(db)
         user_dict = user_repository.get_user_by_email(email)
         if user_dict is None:
-            return None 
+            return None
 
         return UserInDB.model_validate(user_dict)
-    
+
+    async def aget_user(self, db: AsyncSession, email: str):
+        user = await AsyncUserRepository(db).get_user_by_email(email)
+        if user is None:
+            return None
+
+        return UserInDB.model_validate(user)
+
     def verify_password(self,plain_password, hashed_password):
-        return self.pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+        return self.password_hasher.verify_sync(plain_password, hashed_password)
@@ -0,0 +1,206 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, status
+
+from ..core.database import SessionLocal
+from ..models.IngestionJob import IngestionJobRecord
+from ..repositories.ingestion_job_repository import IngestionJobRepository
+from ..utils.file_lock import exclusive_file_lock
+from .resume_service import ResumeService
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionJob:
+    def __init__(self, user_id: int, file_path: str, filename: str, content_hash: str | None = None):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.file_path = file_path
+        self.filename = filename
+        self.content_hash = content_hash
+        self.status = "queued"
+        self.stage = "queued"
+        self.progress = 0.0
+        self.error: str | None = None
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: datetime | None = None
+        self.finished_at: datetime | None = None
+        self.stage_timings: dict[str, float] = {}
+        self._stage_started = time.perf_counter()
+
+    def set_stage(self, stage: str, progress: float) -> None:
+        """Close the timing of the current stage and move on to ``stage``."""
+        now = time.perf_counter()
+        if self.stage != "queued":
+            self.stage_timings[self.stage] = round(now - self._stage_started, 4)
+        self.stage = stage
+        self.progress = progress
+        self._stage_started = now
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "filename": self.filename,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "stage_timings": self.stage_timings,
+        }
+
+    def to_record(self) -> IngestionJobRecord:
+        return IngestionJobRecord(
+            id=self.id, user_id=self.user_id, filename=self.filename, status=self.status,
+            stage=self.stage, progress=self.progress, error=self.error, created_at=self.created_at,
+            started_at=self.started_at, finished_at=self.finished_at, stage_timings=dict(self.stage_timings),
+        )
+
+    @classmethod
+    def from_record(cls, record: IngestionJobRecord) -> "IngestionJob":
+        """A read-only view of a job, possibly run by another worker process."""
+        job = cls(record.user_id, file_path="", filename=record.filename)
+        job.id = record.id
+        job.status = record.status
+        job.stage = record.stage
+        job.progress = record.progress
+        job.error = record.error
+        job.created_at = record.created_at
+        job.started_at = record.started_at
+        job.finished_at = record.finished_at
+        job.stage_timings = dict(record.stage_timings or {})
+        return job
+
+
+class IngestionJobService:
+    """Runs resume ingestion on a bounded background pool.
+
+    Jobs of the same user are serialized: while one is running, later uploads
+    from that user wait in a per-user queue instead of occupying a worker.
+    Across API worker processes, ingestion of a store is also guarded by an
+    flock on ``<INGESTION_LOCK_DIR>/<store>.lock``, so two workers never write
+    the same vector store at once. Job state is written to the ingestion_jobs
+    table, so any worker can answer a status request.
+
+    The lock files must live on storage shared by every process that writes
+    the vector stores (a single host). INGESTION_MAX_PENDING is a per-process
+    limit.
+    """
+
+    def __init__(self, resume_service: ResumeService,
+                 max_workers: int = int(os.getenv("INGESTION_WORKERS", "2")),
+                 max_pending: int = int(os.getenv("INGESTION_MAX_PENDING", "100")),
+                 job_ttl: float = float(os.getenv("INGESTION_JOB_TTL", "3600"))):
+        self.resume_service = resume_service
+        self.max_pending = max_pending
+        self.job_ttl = job_ttl
+        self.lock_dir = os.getenv("INGESTION_LOCK_DIR", "ingestion_locks")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingestion")
+        self._jobs: dict[str, IngestionJob] = {}
+        self._user_queues: dict[int, deque] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, user_id: int, file_path: str, filename: str, content_hash: str | None = None) -> IngestionJob:
+        job = IngestionJob(user_id, file_path, filename, content_hash)
+        with self._lock:
+            self._prune_finished()
+            pending = sum(1 for j in self._jobs.values() if j.status in ("queued", "running"))
+            if pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many resumes are being processed, please retry shortly.",
+                    headers={"Retry-After": "5"},
+                )
+            # Written before the job can start, so a status poll on any worker finds it
+            self._persist(job)
+            self._jobs[job.id] = job
+            if user_id in self._user_queues:
+                # Another upload of this user is in flight; run after it
+                self._user_queues[user_id].append(job)
+            else:
+                self._user_queues[user_id] = deque()
+                self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> IngestionJob | None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        # Submitted to (or already pruned from) another worker process
+        with SessionLocal() as db:
+            record = IngestionJobRepository(db).get_job_by_id(job_id)
+            return IngestionJob.from_record(record) if record is not None else None
+
+    def _persist(self, job: IngestionJob) -> None:
+        with SessionLocal() as db:
+            IngestionJobRepository(db).save(job.to_record())
+
+    def _report_stage(self, job: IngestionJob, stage: str, progress: float) -> None:
+        job.set_stage(stage, progress)
+        try:
+            self._persist(job)
+        except Exception:
+            # Progress reporting must not fail the ingestion itself
+            logger.warning("Could not persist ingestion job %s", job.id, exc_info=True)
+
+    def _run(self, job: IngestionJob) -> None:
+        job.status = "running"
+        job.started_at = datetime.now(timezone.utc)
+        db = None
+        try:
+            db = SessionLocal()
+            # Another worker process may be ingesting an upload of the same user
+            with exclusive_file_lock(os.path.join(self.lock_dir, f"resume_{job.user_id}.lock")):
+                docs = self.resume_service.process_resume(
+                    db, job.file_path, job.user_id,
+                    on_stage=lambda stage, progress: self._report_stage(job, stage, progress),
+                    content_hash=job.content_hash,
+                )
+            if docs is None:
+                raise ValueError("No content could be extracted from the uploaded file")
+            job.status = "succeeded"
+            job.finished_at = datetime.now(timezone.utc)
+            self._report_stage(job, "done", 1.0)
+        except Exception as e:
+            logger.exception("Ingestion job %s failed", job.id, extra={"user_id": job.user_id})
+            job.error = str(e)
+            job.status = "failed"
+            job.finished_at = datetime.now(timezone.utc)
+            self._report_stage(job, "failed", job.progress)
+        finally:
+            if db is not None:
+                db.close()
+            if os.path.exists(job.file_path):
+                os.remove(job.file_path)
+            self._start_next(job.user_id)
+
+    def _start_next(self, user_id: int) -> None:
+        with self._lock:
+            waiting = self._user_queues.get(user_id)
+            if waiting:
+                self._executor.submit(self._run, waiting.popleft())
+            else:
+                self._user_queues.pop(user_id, None)
+
+    def _prune_finished(self) -> None:
+        cutoff = datetime.now(timezone.utc).timestamp() - self.job_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at.timestamp() < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        try:
+            with SessionLocal() as db:
+                IngestionJobRepository(db).delete_finished_before(datetime.fromtimestamp(cutoff, timezone.utc))
+        except Exception:
+            logger.warning("Could not prune finished ingestion jobs", exc_info=True)
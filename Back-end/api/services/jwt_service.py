@@ -22,7 +22,6 @@ class JwtService:
         
     def create_access_token(self, data: dict, expires_delta: timedelta = None) -> Token:
         to_encode = data.copy()
-        print("Data to encode:", to_encode)
         if expires_delta:
             expire = datetime.now(timezone.utc) + expires_delta
         else:
@@ -0,0 +1,70 @@
+import asyncio
+import os
+import threading
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from langchain_core.language_models.chat_models import BaseChatModel
+
+load_dotenv()
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+# Seconds a request may wait for an LLM slot before getting a 503 (0 waits forever)
+LLM_ACQUIRE_TIMEOUT = float(os.getenv("LLM_ACQUIRE_TIMEOUT", "30"))
+
+_chat_model = None
+_chat_model_lock = threading.Lock()
+_llm_semaphore: asyncio.Semaphore | None = None
+
+
+def get_chat_model() -> BaseChatModel:
+    """Process-wide chat model.
+
+    Every service shares this instance, so the provider clients it creates
+    (and their keep-alive connections) are reused across requests instead of
+    being rebuilt per router or per call.
+    """
+    global _chat_model
+    if _chat_model is None:
+        with _chat_model_lock:
+            if _chat_model is None:
+                options = {
+                    "model": os.getenv("GEMINI_MODEL", "gemini-1.5-flash"),
+                    "timeout": float(os.getenv("LLM_TIMEOUT", "60")),
+                    "max_retries": int(os.getenv("LLM_MAX_RETRIES", "2")),
+                }
+                # Imported on first use: the Google client libraries are slow to import
+                from langchain_google_genai import ChatGoogleGenerativeAI
+                if os.getenv("GOOGLE_GENAI_TRANSPORT"):
+                    options["transport"] = os.getenv("GOOGLE_GENAI_TRANSPORT")
+                _chat_model = ChatGoogleGenerativeAI(**options)
+    return _chat_model
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _llm_semaphore
+
+
+@asynccontextmanager
+async def llm_slot():
+    """Hold one of the LLM_MAX_CONCURRENCY in-flight LLM call slots of this process."""
+    semaphore = _get_semaphore()
+    try:
+        if LLM_ACQUIRE_TIMEOUT > 0:
+            await asyncio.wait_for(semaphore.acquire(), timeout=LLM_ACQUIRE_TIMEOUT)
+        else:
+            await semaphore.acquire()
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The AI model is busy, please retry shortly.",
+            headers={"Retry-After": "2"},
+        )
+    try:
+        yield
+    finally:
+        semaphore.release()
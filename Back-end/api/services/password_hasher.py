@@ -0,0 +1,107 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from ..core.metrics import Histogram
+
+load_dotenv()
+
+_TIMING_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+
+
+class PasswordHasher:
+    """bcrypt hashing and verification on a dedicated, bounded thread pool.
+
+    bcrypt is CPU-bound by design but releases the GIL, so a few worker threads
+    hash in parallel while the event loop keeps serving other requests. Once
+    ``workers + max_pending`` operations are in flight, further calls are
+    rejected with 503 + Retry-After instead of queueing without limit.
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 32, rounds: int = 12):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.hash_histogram = Histogram(
+            "password_hash_seconds", "Time spent computing a bcrypt hash", _TIMING_BUCKETS
+        )
+        self.verify_histogram = Histogram(
+            "password_verify_seconds", "Time spent verifying a password against its bcrypt hash", _TIMING_BUCKETS
+        )
+        self.queue_wait_histogram = Histogram(
+            "password_queue_wait_seconds", "Time a hashing job waited for a free bcrypt worker", _TIMING_BUCKETS
+        )
+
+    def hash_sync(self, password: str) -> str:
+        return self.pwd_context.hash(password)
+
+    def verify_sync(self, plain_password: str, hashed_password: str) -> bool:
+        return self.pwd_context.verify(plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(self.hash_histogram, self.hash_sync, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(self.verify_histogram, self.verify_sync, plain_password, hashed_password)
+
+    async def _submit(self, histogram: Histogram, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy, please retry shortly.",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            self.queue_wait_histogram.observe(started - submitted)
+            try:
+                return fn(*args)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        future = self._executor.submit(timed)
+        # Released when the work is done, even if the awaiting request was cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "rounds": self.rounds,
+            "in_flight": in_flight,
+            "rejected": self.rejected,
+            "hash_seconds": self.hash_histogram.snapshot(),
+            "verify_seconds": self.verify_histogram.snapshot(),
+            "queue_wait_seconds": self.queue_wait_histogram.snapshot(),
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32")),
+    rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+)
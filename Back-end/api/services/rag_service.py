@@ -1,12 +1,31 @@
 import os 
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain.vectorstores import Chroma
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import SystemMessage, HumanMessage 
 from langchain_core.prompts import PromptTemplate
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from .llm_client import get_chat_model, llm_slot
+from ..utils.response_cache import response_cache
+from ..utils.semantic_cache import semantic_cache
+from ..utils.context_builder import context_builder, CONTEXT_CANDIDATES, PackedContext
+from ..core.metrics import registry, stage
+import hashlib
+import logging
 from ..utils.document_processing_service import DocumentProcessingService 
 
+logger = logging.getLogger(__name__)
+
+TOKEN_BUCKETS = [50, 100, 250, 500, 1000, 1500, 2000, 4000, 8000, 16000]
+
+
+def record_llm_usage(response) -> None:
+    """Count the input/output tokens reported on a model response (if any)"""
+    usage = getattr(response, "usage_metadata", None) or {}
+    for kind in ("input", "output"):
+        tokens = usage.get(f"{kind}_tokens")
+        if tokens:
+            registry.counter("llm_tokens_total", "Tokens sent to / received from the chat model",
+                             labels={"kind": kind}).inc(tokens)
+
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -14,12 +33,9 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 class RAGService:
     def __init__(self):
         # self.embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        self.embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2") 
+        self.embeddings = DocumentProcessingService.embeddings
 
         self.db_dir = os.path.join(current_dir, "db") 
-        self.model = ChatGoogleGenerativeAI(
-            model="gemini-1.5-flash",
-        )
     
         self.services = {
             "answer_question": self._default_system_prompt(),
@@ -28,6 +44,11 @@ class RAGService:
             "analyze_skills": self._analyze_skills_prompt(),
         }
 
+    @property
+    def model(self):
+        """The shared chat model, created on first use rather than at router construction"""
+        return get_chat_model()
+
     def _default_system_prompt(self):
         return (
             "You are a helpful AI career assistant that provides personalized answers "
@@ -54,86 +75,231 @@ class RAGService:
             "List them under separate headings. Be specific."
         )
 
+    def prompt_version(self, service_type: str) -> str:
+        """Short hash of the system prompt, so editing a prompt invalidates its cached answers"""
+        system_prompt = self.services.get(service_type, self._default_system_prompt())
+        return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:12]
+
+    async def acached_service_response(self, user_id: int, service_type: str, produce):
+        """Answer of a resume-level service, served from the response cache when possible.
+
+        ``produce`` is an async callable running retrieval + model call on a miss.
+        Keys are (user, resume version, service type, prompt version); failed
+        retrievals raise out of ``produce`` and failed model calls are never
+        cached.
+        """
+        resume_version = await run_in_threadpool(
+            DocumentProcessingService.get_resume_version, f"resume_{user_id}"
+        )
+        key = (user_id, resume_version, service_type, self.prompt_version(service_type))
+        if resume_version is not None:
+            cached = response_cache.get(key, service_type)
+            if cached is not None:
+                return cached
+
+        response = await produce()
+        if not hasattr(response, "content"):
+            return response
+        usage = getattr(response, "usage_metadata", None) or {}
+        if resume_version is not None:
+            response_cache.set(key, response.content, tokens=usage.get("total_tokens", 0))
+        return response.content
+
+    async def asemantic_cached_answer(self, user_id: int, question: str, produce):
+        """Answer a free-form question, reusing the answer of a near-duplicate earlier question.
+
+        ``produce`` is an async callable returning the model response, or None
+        when there is nothing to answer from; None is passed through. A failed
+        model call raises RuntimeError. Keyword-only questions bypass the
+        cache: retrieval answers them from BM25 without a query embedding.
+        """
+        store_name = f"resume_{user_id}"
+
+        def lookup_inputs():
+            resume_version = DocumentProcessingService.get_resume_version(store_name)
+            if resume_version is None:
+                return None, None
+            if DocumentProcessingService.retrieval_mode == "hybrid":
+                keyword_index = DocumentProcessingService.get_bm25_index(store_name)
+                if keyword_index is not None and keyword_index.is_keyword_query(question):
+                    return resume_version, None
+            # The question embedding lands in the embedding cache, so retrieval reuses it
+            return resume_version, self.embeddings.embed_query(question)
+
+        with stage("semantic_cache"):
+            resume_version, question_vector = await run_in_threadpool(lookup_inputs)
+            cached = semantic_cache.lookup(user_id, question_vector, resume_version) if question_vector is not None else None
+        if cached is not None:
+            return cached
+
+        response = await produce()
+        if response is None:
+            return None
+        if not hasattr(response, "content"):
+            # aask_model_with_question reports model failures as a string
+            raise RuntimeError(str(response))
+        if question_vector is not None:
+            semantic_cache.store(user_id, question_vector, response.content, resume_version)
+        return response.content
+
     def build_human_prompt(self, context: str, question: str) -> str:
         return f"""Here is the resume context:\n\n{context}\n\nUser's question: {question}"""
 
+    def build_messages(self, context: str, service_type: str, question: str | None = None) -> list:
+        """System + human messages for a service; without a question the context alone is sent."""
+        system_prompt = self.services.get(service_type, self._default_system_prompt())
+        human_prompt = self.build_human_prompt(context, question) if question else context
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=human_prompt),
+        ]
+
     def ask_model_with_question(self, context: str, question: str, service_type: str = "answer_question"):
         """Ask model with both context and a specific question"""
-        print(f"\n=== ASKING MODEL WITH QUESTION ===")
-        print(f"Context length: {len(context)} characters")
-        print(f"Question: {question}")
-        print(f"Service type: {service_type}")
+        logger.debug("Asking model with question", extra={"service_type": service_type, "context_chars": len(context)})
         
         try:
-            system_prompt = self.services.get(service_type, self._default_system_prompt())
-            print(f"Using system prompt: {system_prompt}")
-            human_prompt = self.build_human_prompt(context, question)
-
-            response = self.model.invoke([
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=human_prompt),
-            ])
+            messages = self.build_messages(context, service_type, question)
+
+            with stage("llm"):
+                response = self.model.invoke(messages)
+            record_llm_usage(response)
             return response
         except Exception as e:
             return f"Error during model invocation: {e}"
         
     def ask_model(self, context: str, service_type):
         """Ask model with just context (for services like rating, analysis, etc.)"""
-        print(f"\n=== ASKING MODEL ===")
-        print(f"Context length: {len(context)} characters")
-        print(f"Service type: {service_type}")
+        logger.debug("Asking model", extra={"service_type": service_type, "context_chars": len(context)})
         
         try:
             if not context.strip():
                 raise ValueError("Resume context is empty. Cannot proceed.")
-            system_prompt = self.services.get(service_type, self._default_system_prompt())
-            print(f"Using system prompt: {system_prompt}")
+            messages = self.build_messages(context, service_type)
             
-            response = self.model.invoke([
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=context),
-            ])
+            with stage("llm"):
+                response = self.model.invoke(messages)
+            record_llm_usage(response)
+            return response
+        except Exception as e:
+            return f"Error during model invocation: {e}"
+
+    async def aask_model_with_question(self, context: str, question: str, service_type: str = "answer_question"):
+        """Async ask_model_with_question; waits for a free LLM slot instead of a thread"""
+        try:
+            async with llm_slot():
+                with stage("llm"):
+                    response = await self.model.ainvoke(self.build_messages(context, service_type, question))
+            record_llm_usage(response)
             return response
+        except HTTPException:
+            raise
         except Exception as e:
             return f"Error during model invocation: {e}"
 
+    async def aask_model(self, context: str, service_type):
+        """Async ask_model"""
+        try:
+            if not context.strip():
+                raise ValueError("Resume context is empty. Cannot proceed.")
+            async with llm_slot():
+                with stage("llm"):
+                    response = await self.model.ainvoke(self.build_messages(context, service_type))
+            record_llm_usage(response)
+            return response
+        except HTTPException:
+            raise
+        except Exception as e:
+            return f"Error during model invocation: {e}"
+
+    async def stream_model(self, context: str, service_type: str = "answer_question", question: str | None = None):
+        """Yield message chunks as the chat model produces them.
+
+        Closing the generator (e.g. on client disconnect) closes the upstream stream.
+        """
+        if not context.strip():
+            raise ValueError("Resume context is empty. Cannot proceed.")
+        message = None
+        async with llm_slot():
+            with stage("llm"):
+                async for chunk in self.model.astream(self.build_messages(context, service_type, question)):
+                    message = chunk if message is None else message + chunk
+                    yield chunk
+        record_llm_usage(message)
+
     def load_vectorstore(self):
         """Load the Chroma vector database"""
         try:
+            from langchain_community.vectorstores import Chroma
             vectorstore = Chroma(
                 persist_directory=self.db_dir,
                 embedding_function=self.embeddings
             )
             return vectorstore
         except Exception as e:
-            print(f"Error loading vectorstore: {e}")
+            logger.error("Error loading vectorstore: %s", e)
             return None
 
-    def retrieve_context(self, query: str, k: int = 5):
+    def get_resume_context(self, user_id: int):
+        """Whole resume in document order with chunk overlaps removed, for services reading all of it.
+
+        Returns (chunks, context); no query embedding or similarity search involved.
+        """
+        with stage("fetch_chunks"):
+            docs = DocumentProcessingService.get_document_chunks(f"resume_{user_id}")
+        with stage("context_build"):
+            return docs, DocumentProcessingService.join_chunks(docs)
+
+    async def aget_resume_context(self, user_id: int):
+        """Async get_resume_context"""
+        return await run_in_threadpool(self.get_resume_context, user_id)
+
+    def retrieve_packed_context(self, user_id: int, query: str, k: int = CONTEXT_CANDIDATES) -> PackedContext:
+        """Retrieve k candidate chunks and pack the relevant ones into the context token budget"""
+        scored = DocumentProcessingService.retrieve_scored(f"resume_{user_id}", query, k=k)
+        with stage("context_build"):
+            packed = context_builder.build(
+                scored, higher_is_better=True,
+                # Hybrid retrieval already cut the vector ranking at its score gap before fusing
+                use_score_gap=DocumentProcessingService.retrieval_mode != "hybrid",
+            )
+        registry.histogram("rag_context_tokens", "Tokens of packed question contexts", TOKEN_BUCKETS).observe(packed.tokens)
+        return packed
+
+    async def aretrieve_packed_context(self, user_id: int, query: str, k: int = CONTEXT_CANDIDATES) -> PackedContext:
+        """Async retrieve_packed_context"""
+        return await run_in_threadpool(self.retrieve_packed_context, user_id, query, k)
+
+    def retrieve_context(self, query: str, k: int = CONTEXT_CANDIDATES, *, user_id: int):
         """Retrieve relevant context from the vector database"""
-    
-        vectorstore = DocumentProcessingService.get_vector_store(f"resume_{str(6)}")
-        
-        if vectorstore is None:
-            return "No context available - vectorstore could not be loaded."
-        
         try:
-            docs = vectorstore.similarity_search(query, k=k)
-            context = "\n\n".join([doc.page_content for doc in docs])
-            return context
+            return self.retrieve_packed_context(user_id, query, k=k).text
         except Exception as e:
             return f"Error retrieving context: {e}"
 
-    def get_response(self, question: str, service_type: str = "answer_question", k: int = 5):
+    def get_response(self, question: str, service_type: str = "answer_question", k: int = CONTEXT_CANDIDATES, *, user_id: int):
         """Complete RAG pipeline: retrieve context and generate response"""
-        # Retrieve relevant context
-        print(f"\n=== RETRIEVING CONTEXT ===")
-        print(f"Question: {question}")
-        
-        context = self.retrieve_context(question, k=k)
+        logger.debug("Running pipeline", extra={"user_id": user_id, "service_type": service_type})
         
         # Generate response based on service type
         if service_type == "answer_question":
+            context = self.retrieve_context(question, k=k, user_id=user_id)
             return self.ask_model_with_question(context, question, service_type)
         else:
-            return self.ask_model(context, service_type)
\ No newline at end of file
+            try:
+                context = self.get_resume_context(user_id)[1]
+            except Exception as e:
+                context = f"Error retrieving context: {e}"
+            return self.ask_model(context, service_type)
+
+    async def aget_response(self, question: str, service_type: str = "answer_question", k: int = CONTEXT_CANDIDATES, *, user_id: int):
+        """Async get_response; retrieval errors are raised instead of being sent to the model as context"""
+        if service_type == "answer_question":
+            context = (await self.aretrieve_packed_context(user_id, question, k=k)).text
+        else:
+            context = (await self.aget_resume_context(user_id))[1]
+
+        if service_type == "answer_question":
+            return await self.aask_model_with_question(context, question, service_type)
+        else:
+            return await self.aask_model(context, service_type)
@@ -1,49 +1,98 @@
+import hashlib
+import logging
 import os
 import uuid
 from datetime import datetime
+from typing import Callable, NamedTuple
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
 from ..utils.document_processing_service import DocumentProcessingService
 from ..models.Resume import Resume
 from ..repositories.resume_repository import ResumeRepository
+from ..utils.response_cache import response_cache
+from ..utils.semantic_cache import semantic_cache
+from ..utils.context_builder import context_builder, CONTEXT_CANDIDATES
+from ..core.metrics import registry, stage
+
+logger = logging.getLogger(__name__)
+
+
+class SavedUpload(NamedTuple):
+    path: str
+    sha256: str
+    size: int
 
 
 class ResumeService:
 
     UPLOAD_DIR = "uploads/resumes"
+    ALLOWED_EXTENSIONS = ('.pdf', '.docx', '.html')
+    MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+    UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-    def save_file(self ,user_id: int, file: UploadFile) -> str:
-        allowed_extensions = ['.pdf', '.docx', '.html']
-        extension = os.path.splitext(file.filename)[1].lower()
+    @classmethod
+    def validate_extension(cls, filename: str) -> str:
+        extension = os.path.splitext(filename or "")[1].lower()
+        if extension not in cls.ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail="Unsupported file type. Only PDF, DOCX, and HTML files are allowed."
+            )
+        return extension
 
-        if extension not in allowed_extensions:
-            raise HTTPException(status_code=400, detail="Unsupported file type.")
+    def save_file(self ,user_id: int, file: UploadFile) -> SavedUpload:
+        """Stream the upload to disk in fixed-size chunks, hashing it on the way.
+
+        Oversized requests are normally refused by BodySizeLimitMiddleware
+        before the form is parsed; the copy still aborts with 413 as soon as it
+        exceeds MAX_UPLOAD_BYTES. The file only appears under its final name
+        once fully written.
+        """
+        self.validate_extension(file.filename)
         user_folder = os.path.join(ResumeService.UPLOAD_DIR, str(user_id))
         os.makedirs(user_folder, exist_ok=True)
 
-        unique_filename = f"{uuid.uuid4()}_{file.filename}"
+        unique_filename = f"{uuid.uuid4()}_{os.path.basename(file.filename)}"
         file_path = os.path.join(user_folder, unique_filename)
+        temp_path = f"{file_path}.part"
 
-        with open(file_path, "wb") as f:
-            f.write(file.file.read())
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(temp_path, "wb") as f:
+                while chunk := file.file.read(self.UPLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > self.MAX_UPLOAD_BYTES:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"File too large. Maximum size is {self.MAX_UPLOAD_BYTES} bytes."
+                        )
+                    digest.update(chunk)
+                    f.write(chunk)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
 
-        return file_path
+        return SavedUpload(path=file_path, sha256=digest.hexdigest(), size=size)
 
-    def process_resume(self, db: Session, file_path: str, user_id: int):
-        print(f"\n=== PROCESSING RESUME ===")
-        print(f"File path: {file_path}")
-        print(f"User ID: {user_id}")
+    def process_resume(self, db: Session, file_path: str, user_id: int,
+                       on_stage: Callable[[str, float], None] | None = None,
+                       content_hash: str | None = None):
+        """Ingest a saved resume. ``on_stage(stage, progress)`` is called as each stage starts."""
+        report = on_stage or (lambda stage, progress: None)
+        logger.info("Processing resume", extra={"user_id": user_id, "file": os.path.basename(file_path)})
         
         # Step 1: Load document
-        docs = DocumentProcessingService.load_document(file_path)
-        print(f"Loaded documents: {len(docs)}")
+        report("loading", 0.1)
+        with stage("load_document"):
+            docs = DocumentProcessingService.load_document(file_path)
         
-        if docs:
-            print(f"First document content length: {len(docs[0].page_content)}")
-            print(f"First document content preview: {docs[0].page_content[:200]}...")
-        else:
-            print("ERROR: No documents loaded from file!")
+        if not docs:
+            logger.error("No documents loaded from file", extra={"user_id": user_id, "file": file_path})
             return None
+        logger.debug("Loaded %d documents", len(docs))
 
         # Step 2: Add metadata
         metadata = {
@@ -51,8 +100,9 @@ class ResumeService:
             "source": os.path.basename(file_path),
             "uploaded_at": datetime.now().isoformat()
         }
+        if content_hash:
+            metadata["content_hash"] = content_hash
         docs = DocumentProcessingService.add_metadata(docs, metadata)
-        print(f"Added metadata: {metadata}")
 
         # Create resume record in DB
         resume_repository = ResumeRepository(db)
@@ -64,24 +114,32 @@ class ResumeService:
         resume_db = resume_repository.create_resume(resume)
 
         # Split documents
-        chunks = DocumentProcessingService.split_documents(docs)
-        print(f"Created chunks: {len(chunks)}")
+        report("splitting", 0.4)
+        with stage("split_documents"):
+            chunks = DocumentProcessingService.split_documents(docs)
         
-        if chunks:
-            print(f"First chunk content length: {len(chunks[0].page_content)}")
-            print(f"First chunk metadata: {chunks[0].metadata}")
-            print(f"First chunk content preview: {chunks[0].page_content[:200]}...")
-        else:
-            print("ERROR: No chunks created!")
+        if not chunks:
+            logger.error("No chunks created", extra={"user_id": user_id, "file": file_path})
             return None
+        logger.debug("Created %d chunks", len(chunks))
         
         # Store in vector DB
+        report("indexing", 0.6)
         store_name = f"resume_{user_id}"
-        DocumentProcessingService.store_documents(chunks, store_name)
+        with stage("store_documents"):
+            DocumentProcessingService.store_documents(chunks, store_name)
+        registry.histogram(
+            "ingestion_chunks", "Chunks produced per ingested resume", [1, 2, 5, 10, 20, 50, 100, 200, 500]
+        ).observe(len(chunks))
+        # Answers generated for the previous version are stale now
+        response_cache.invalidate_user(user_id)
+        semantic_cache.invalidate_user(user_id)
         
-        # Verify storage
-        debug_info = DocumentProcessingService.debug_collection(store_name)
-        print(f"Final verification: {debug_info}")
+        # Verify storage; reading the collection back is only worth it when debugging
+        report("verifying", 0.9)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Final verification: %s", DocumentProcessingService.debug_collection(store_name))
+        logger.info("Resume processed", extra={"user_id": user_id, "documents": len(docs), "chunks": len(chunks)})
 
         return docs
     
@@ -90,38 +148,25 @@ class ResumeService:
         """
         Ask a question based on the user's resume.
         """
-        print(f"\n=== ASKING BASED ON RESUME ===")
-        print(f"User ID: {user_id}")
-        print(f"Question: {question}")
-
-        # Get vector store for user's resume
-        vector_store = DocumentProcessingService.get_vector_store(f"resume_{user_id}")
+        # Retrieve candidate documents (hybrid or vector) and pack the relevant ones into the token budget
+        scored = DocumentProcessingService.retrieve_scored(f"resume_{user_id}", question, k=CONTEXT_CANDIDATES)
+        with stage("context_build"):
+            packed = context_builder.build(
+                scored, higher_is_better=True,
+                # Hybrid retrieval already cut the vector ranking at its score gap before fusing
+                use_score_gap=DocumentProcessingService.retrieval_mode != "hybrid",
+            )
+        logger.debug("Packed %d of %d retrieved documents (%d tokens)", len(packed.chunks), packed.candidates, packed.tokens)
         
-        if not vector_store:
-            raise HTTPException(status_code=404, detail="Resume not found for this user.")
-        
-        # Retrieve relevant documents based on the user's question
-        retrieved_docs = vector_store.similarity_search(question, k=5)
-        print(f"Retrieved {len(retrieved_docs)} relevant documents")
-        
-        if not retrieved_docs:
+        if not packed.chunks:
             return {
                 "answer": "I don't have access to your resume information. Please upload your resume first.",
                 "sources": []
             }
         
-        print(f"Retrieved {len(retrieved_docs)} relevant documents")
-        
-        # Combine retrieved documents into context
-        context = "\n\n".join([
-            f"Resume Section {i+1}:\n{doc.page_content}" 
-            for i, doc in enumerate(retrieved_docs)
-        ])
-        
         return {
             "question": question,
-            "context": context,
-            "relevant_documents": retrieved_docs
+            "context": packed.text,
+            "context_tokens": packed.tokens,
+            "relevant_documents": packed.chunks
         }
-
-        
\ No newline at end of file
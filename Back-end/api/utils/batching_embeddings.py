@@ -0,0 +1,112 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from ..core.metrics import Histogram
+
+
+class _EmbedRequest:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class BatchingEmbeddings(Embeddings):
+    """Coalesces concurrent embed calls into batched ``encode`` calls.
+
+    Callers block on a future while a single background worker drains the
+    queue, gathering requests until either ``max_batch_size`` texts are
+    pending or the oldest request has waited ``max_wait_ms``. The combined
+    batch goes to the wrapped model in one call and the vectors are scattered
+    back to each caller.
+    """
+
+    def __init__(self, embeddings: Embeddings, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[_EmbedRequest]" = queue.Queue()
+        self._carry: _EmbedRequest | None = None
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+        self.batch_size_histogram = Histogram(
+            "embedding_batch_size", "Texts per batched encode call",
+            [1, 2, 4, 8, 16, 32, 64, 128, 256],
+        )
+        self.queue_wait_histogram = Histogram(
+            "embedding_queue_wait_seconds", "Time an embed request waited before its batch ran",
+            [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0],
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        self._ensure_worker()
+        request = _EmbedRequest(list(texts))
+        self._queue.put(request)
+        return request.future.result()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+
+    def _next_batch(self) -> list[_EmbedRequest]:
+        first = self._carry or self._queue.get()
+        self._carry = None
+        batch, size = [first], len(first.texts)
+        deadline = first.enqueued_at + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if size + len(request.texts) > self.max_batch_size:
+                # Keep the batch bounded; this request opens the next one
+                self._carry = request
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            started = time.perf_counter()
+            texts = [text for request in batch for text in request.texts]
+            for request in batch:
+                self.queue_wait_histogram.observe(started - request.enqueued_at)
+            self.batch_size_histogram.observe(len(texts))
+            try:
+                vectors = self.embeddings.embed_documents(texts)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            offset = 0
+            for request in batch:
+                request.future.set_result(vectors[offset:offset + len(request.texts)])
+                offset += len(request.texts)
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize(),
+            "batch_size": self.batch_size_histogram.snapshot(),
+            "queue_wait_seconds": self.queue_wait_histogram.snapshot(),
+        }
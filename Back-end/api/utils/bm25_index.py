@@ -0,0 +1,109 @@
+import json
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from typing import List
+
+from langchain_core.documents import Document
+
+# Keeps tech terms such as c++, c#, node.js or ci-cd in one piece
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from has have i in is it me my of on or "
+    "the to was what which who with you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = (token.rstrip(".-") for token in _TOKEN_PATTERN.findall(text.lower()))
+    return [token for token in tokens if token and token not in _STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 inverted index over the chunks of one store."""
+
+    def __init__(self, ids: list[str], documents: list[str], metadatas: list[dict], k1: float = 1.5, b: float = 0.75,
+                 postings: dict | None = None, doc_lengths: list[int] | None = None):
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = [metadata or {} for metadata in metadatas]
+        self.k1 = k1
+        self.b = b
+        if postings is not None and doc_lengths is not None:
+            # Loaded from disk: no re-tokenization
+            self.postings = {term: [tuple(entry) for entry in entries] for term, entries in postings.items()}
+            self.doc_lengths = list(doc_lengths)
+        else:
+            self.postings = defaultdict(list)
+            self.doc_lengths = []
+            for index, text in enumerate(self.documents):
+                counts = Counter(tokenize(text))
+                self.doc_lengths.append(sum(counts.values()))
+                for term, tf in counts.items():
+                    self.postings[term].append((index, tf))
+            self.postings = dict(self.postings)
+        self.avg_length = sum(self.doc_lengths) / len(self.doc_lengths) if self.doc_lengths else 0.0
+        n = len(self.documents)
+        self.idf = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def search(self, query: str, k: int = 5) -> List[tuple[Document, float]]:
+        """Top-k chunks by BM25 score (higher is better); chunks sharing no term are left out."""
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for index, tf in self.postings.get(term, ()):
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[index] / (self.avg_length or 1))
+                scores[index] += idf * tf * (self.k1 + 1) / (tf + norm)
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [
+            (Document(page_content=self.documents[index], metadata=self.metadatas[index]), score)
+            for index, score in top
+        ]
+
+    def is_keyword_query(self, query: str, max_words: int = 3) -> bool:
+        """Short queries made only of indexed terms (e.g. "Kubernetes") need no semantic search."""
+        if len(query.split()) > max_words:
+            return False
+        terms = tokenize(query)
+        return bool(terms) and all(term in self.idf for term in terms)
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "ids": self.ids,
+                "documents": self.documents,
+                "metadatas": self.metadatas,
+                "postings": self.postings,
+                "doc_lengths": self.doc_lengths,
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["ids"], data["documents"], data["metadatas"],
+                   postings=data.get("postings"), doc_lengths=data.get("doc_lengths"))
+
+
+def reciprocal_rank_fusion(rankings: list[list[tuple[Document, float]]], key, k: int, rrf_k: int = 60) -> List[tuple[Document, float]]:
+    """Merge best-first rankings; each document scores sum(1 / (rrf_k + rank)) over the rankings it appears in."""
+    fused: dict[str, float] = defaultdict(float)
+    documents: dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, (doc, _) in enumerate(ranking, start=1):
+            doc_key = key(doc)
+            fused[doc_key] += 1.0 / (rrf_k + rank)
+            documents.setdefault(doc_key, doc)
+    top = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+    return [(documents[doc_key], score) for doc_key, score in top]
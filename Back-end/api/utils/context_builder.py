@@ -0,0 +1,145 @@
+import logging
+import os
+import time
+from typing import List, NamedTuple
+
+from dotenv import load_dotenv
+from langchain_core.documents import Document
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+def overlap_length(previous: str, text: str, max_overlap: int = 100, min_overlap: int = 10) -> int:
+    """Length of the longest suffix of ``previous`` that is also a prefix of ``text``."""
+    for size in range(min(max_overlap, len(previous), len(text)), min_overlap - 1, -1):
+        if previous.endswith(text[:size]):
+            return size
+    return 0
+
+
+class PackedContext(NamedTuple):
+    text: str
+    tokens: int
+    chunks: List[Document]
+    candidates: int
+
+
+class ContextBuilder:
+    """Packs retrieved chunks into a prompt context under a token budget.
+
+    Candidates are taken best-first, cut off at the first sharp drop in
+    relevance (unless ``use_score_gap`` is off, e.g. for rank-fused scores,
+    whose steps say how many rankings found a chunk rather than how relevant
+    it is), stripped of text already present in the selected chunks, and
+    added while they fit in ``max_tokens`` (counted with tiktoken). The
+    selected chunks are emitted in document order.
+    """
+
+    def __init__(self, max_tokens: int = 1500, encoding_name: str = "cl100k_base",
+                 gap_ratio: float = 0.5, min_chunks: int = 1, max_overlap: int = 200,
+                 separator: str = "\n\n", encoding_retry_seconds: float = 60.0):
+        self.max_tokens = max_tokens
+        self.encoding_name = encoding_name
+        self.gap_ratio = gap_ratio
+        self.min_chunks = min_chunks
+        self.max_overlap = max_overlap
+        self.separator = separator
+        self.encoding_retry_seconds = encoding_retry_seconds
+        self._encoding = None
+        self._encoding_retry_at = 0.0
+
+    def _get_encoding(self):
+        if self._encoding is None and time.monotonic() >= self._encoding_retry_at:
+            try:
+                import tiktoken
+                self._encoding = tiktoken.get_encoding(self.encoding_name)
+            except Exception as e:
+                # The BPE file is downloaded on first use; estimate (chars/4) until a retry succeeds
+                self._encoding_retry_at = time.monotonic() + self.encoding_retry_seconds
+                logger.warning("tiktoken encoding %s unavailable, estimating tokens for the next %.0fs: %s",
+                               self.encoding_name, self.encoding_retry_seconds, e)
+        return self._encoding
+
+    def count_tokens(self, text: str) -> int:
+        encoding = self._get_encoding()
+        if encoding is None:
+            return (len(text) + 3) // 4
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        encoding = self._get_encoding()
+        if encoding is None:
+            return text[:max_tokens * 4]
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+    def cut_at_score_gap(self, relevances: list[float]) -> int:
+        """Number of leading candidates to keep before the first sharp relevance drop."""
+        if len(relevances) < 2:
+            return len(relevances)
+        spread = relevances[0] - relevances[-1]
+        if spread <= 0:
+            return len(relevances)
+        for i in range(max(self.min_chunks, 1), len(relevances)):
+            if relevances[i - 1] - relevances[i] >= self.gap_ratio * spread:
+                return i
+        return len(relevances)
+
+    def _strip_duplicates(self, text: str, selected: list[str]) -> str:
+        for other in selected:
+            if text in other:
+                return ""
+            text = text[overlap_length(other, text, self.max_overlap):]
+            tail = overlap_length(text, other, self.max_overlap)
+            if tail:
+                text = text[:-tail]
+        return text.strip()
+
+    def build(self, scored_docs: list[tuple[Document, float]], higher_is_better: bool = False,
+              use_score_gap: bool = True) -> PackedContext:
+        """Pack (document, score) pairs; scores are distances unless ``higher_is_better``."""
+        ranked = sorted(scored_docs, key=lambda pair: pair[1], reverse=higher_is_better)
+        if use_score_gap:
+            relevances = [score if higher_is_better else -score for _, score in ranked]
+            ranked = ranked[:self.cut_at_score_gap(relevances)]
+
+        separator_tokens = self.count_tokens(self.separator)
+        selected: list[tuple[Document, str]] = []
+        used = 0
+        for doc, _ in ranked:
+            text = self._strip_duplicates(doc.page_content, [t for _, t in selected])
+            if not text:
+                continue
+            tokens = self.count_tokens(text) + (separator_tokens if selected else 0)
+            if used + tokens > self.max_tokens:
+                if selected:
+                    continue
+                # Never return an empty context because the best chunk alone is too long
+                text = self._truncate(text, self.max_tokens)
+                tokens = self.count_tokens(text)
+            selected.append((doc, text))
+            used += tokens
+
+        selected.sort(key=lambda pair: (
+            pair[0].metadata.get("chunk_index", float("inf")),
+            pair[0].metadata.get("page", 0),
+            pair[0].metadata.get("start_index", 0),
+        ))
+        text = self.separator.join(t for _, t in selected)
+        return PackedContext(
+            text=text,
+            tokens=self.count_tokens(text) if selected else 0,
+            chunks=[doc for doc, _ in selected],
+            candidates=len(scored_docs),
+        )
+
+
+context_builder = ContextBuilder(
+    max_tokens=int(os.getenv("CONTEXT_MAX_TOKENS", "1500")),
+    encoding_name=os.getenv("CONTEXT_TOKEN_ENCODING", "cl100k_base"),
+    gap_ratio=float(os.getenv("CONTEXT_SCORE_GAP_RATIO", "0.5")),
+    encoding_retry_seconds=float(os.getenv("CONTEXT_ENCODING_RETRY_SECONDS", "60")),
+)
+# How many chunks retrieval hands to the builder; the builder decides how many are used
+CONTEXT_CANDIDATES = int(os.getenv("CONTEXT_CANDIDATES", "8"))
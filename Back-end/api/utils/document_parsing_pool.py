@@ -0,0 +1,145 @@
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import List
+
+from langchain_core.documents import Document
+
+
+class DocumentParsingError(ValueError):
+    """Raised when a file cannot be parsed within the configured limits."""
+
+
+def parse_document(file_path: str, max_pages: int = 0) -> list[tuple[str, dict]]:
+    """Parse a resume file into (page_content, metadata) pairs.
+
+    Runs inside parser worker processes, so loaders are imported lazily and the
+    result is kept to plain picklable values.
+    """
+    if file_path.endswith('.pdf'):
+        from langchain_community.document_loaders import PyPDFLoader
+        from pypdf import PdfReader
+
+        if max_pages:
+            page_count = len(PdfReader(file_path).pages)
+            if page_count > max_pages:
+                raise DocumentParsingError(f"PDF has {page_count} pages, the limit is {max_pages}")
+        loader = PyPDFLoader(file_path)
+    elif file_path.endswith('.docx'):
+        from langchain_community.document_loaders import Docx2txtLoader
+        loader = Docx2txtLoader(file_path)
+    elif file_path.endswith('.html'):
+        from langchain_community.document_loaders import UnstructuredHTMLLoader
+        loader = UnstructuredHTMLLoader(file_path)
+    else:
+        raise ValueError(f"Unsupported file type: {file_path}")
+
+    docs = loader.load()
+    if max_pages and len(docs) > max_pages:
+        raise DocumentParsingError(f"Document has {len(docs)} pages, the limit is {max_pages}")
+    return [(doc.page_content, dict(doc.metadata)) for doc in docs]
+
+
+def _raise_timeout(signum, frame):
+    raise DocumentParsingError("Parsing exceeded the time limit")
+
+
+def _parse_with_deadline(file_path: str, max_pages: int, timeout: float) -> list[tuple[str, dict]]:
+    # Worker-side deadline: interrupts pure-Python parsers cleanly so the
+    # worker survives. The parent still kills the pool if this never fires.
+    use_alarm = timeout > 0 and hasattr(signal, "setitimer")
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return parse_document(file_path, max_pages)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+class DocumentParsingPool:
+    """Parses documents in a recycled process pool with wall-clock and page limits.
+
+    Workers are replaced after ``max_tasks_per_child`` files. When a parse
+    overruns its deadline in a way the worker cannot interrupt, the whole pool
+    is terminated and rebuilt; parses that were in flight on it are retried
+    once on the new pool. At most ``workers`` parses are submitted at a time
+    (callers beyond that wait before submitting), so a job starts as soon as
+    it is submitted and the deadline never counts time spent queued.
+    ``workers=0`` parses in the calling thread.
+    """
+
+    def __init__(self, workers: int = 2, timeout: float = 30.0, max_pages: int = 50,
+                 max_tasks_per_child: int = 50, kill_grace: float = 5.0):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_tasks_per_child = max_tasks_per_child
+        self.kill_grace = kill_grace
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(workers, 1))
+
+    def parse(self, file_path: str) -> List[Document]:
+        if self.workers <= 0:
+            pages = parse_document(file_path, self.max_pages)
+        else:
+            with self._slots:
+                pages = self._parse_in_pool(file_path)
+        return [Document(page_content=content, metadata=metadata) for content, metadata in pages]
+
+    def _parse_in_pool(self, file_path: str, retry: bool = True) -> list[tuple[str, dict]]:
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_parse_with_deadline, file_path, self.max_pages, self.timeout)
+        except (BrokenProcessPool, RuntimeError):
+            self._recycle(executor)
+            if retry:
+                return self._parse_in_pool(file_path, retry=False)
+            raise DocumentParsingError("Document parser pool is unavailable")
+
+        wait = self.timeout + self.kill_grace if self.timeout > 0 else None
+        try:
+            return future.result(timeout=wait)
+        except FuturesTimeoutError:
+            future.cancel()
+            self._recycle(executor)
+            raise DocumentParsingError("Parsing exceeded the time limit")
+        except BrokenProcessPool:
+            # Another file's timeout tore the pool down under this one
+            self._recycle(executor)
+            if retry:
+                return self._parse_in_pool(file_path, retry=False)
+            raise DocumentParsingError("Document parser worker crashed")
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # spawn: never fork a process that holds model and batching threads
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_tasks_per_child or None,
+                )
+            return self._executor
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # ProcessPoolExecutor has no public way to kill a hung worker
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            if process.is_alive():
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
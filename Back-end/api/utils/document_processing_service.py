@@ -1,37 +1,106 @@
-from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader, UnstructuredHTMLLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings ,ChatOpenAI
 # from langchain_community.embeddings import HuggingFaceEmbeddings
 
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Chroma
 from langchain_core.documents import Document
 from typing import List
 import os
+import hashlib
+import logging
+import shutil
 from datetime import datetime
 from dotenv import load_dotenv
 import chromadb
+from chromadb.config import Settings
+import threading
+import weakref
+from functools import partial
+from chromadb.api.shared_system_client import SharedSystemClient
+from .vector_store_cache import VectorStoreCache
+from .embedding_cache import CachedEmbeddings
+from .embedding_provider import EmbeddingProvider, LazyEmbeddings
+from .embedding_backends import create_embedding_backend
+from .batching_embeddings import BatchingEmbeddings
+from .document_parsing_pool import DocumentParsingPool
+from .context_builder import overlap_length, context_builder
+from .numpy_retriever import NumpyVectorStore
+from .bm25_index import BM25Index, reciprocal_rank_fusion
+from ..core.metrics import stage
 
+logger = logging.getLogger(__name__)
 
 
 class DocumentProcessingService:
     load_dotenv()
     # embeddings = OpenAIEmbeddings()  
-    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2") 
+    embedding_model_name = "sentence-transformers/all-MiniLM-L6-v2"
+    # "fp32": full precision sentence-transformers on CPU
+    # "int8": dynamically quantized Linear layers, faster on CPU with a small drift
+    #         (measure it with `python -m api.utils.embedding_parity`)
+    embedding_backend = os.getenv("EMBEDDING_BACKEND", "fp32")
+    # 0 keeps torch's default intra-op thread count
+    embedding_threads = int(os.getenv("EMBEDDING_THREADS", "0"))
+    embedding_batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+    # One model per process, loaded on first use or by the startup warm-up
+    embedding_provider = EmbeddingProvider(
+        embedding_model_name,
+        factory=partial(create_embedding_backend, embedding_backend,
+                        batch_size=embedding_batch_size, threads=embedding_threads),
+    )
+    # Identifies the vector space: recorded on every collection, and stores indexed
+    # under another signature are re-embedded when opened (see _sync_embedding_model)
+    embedding_signature = embedding_model_name if embedding_backend == "fp32" else f"{embedding_model_name}:{embedding_backend}"
+    base_embeddings = LazyEmbeddings(embedding_provider)
+    if os.getenv("EMBEDDING_BATCHING", "true").lower() == "true":
+        # Concurrent cache misses are coalesced into one encode call
+        base_embeddings = BatchingEmbeddings(
+            base_embeddings,
+            max_batch_size=int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "64")),
+            max_wait_ms=float(os.getenv("EMBEDDING_MAX_WAIT_MS", "5")),
+        )
+    # Shared with RAGService: identical text is embedded at most once per model.
+    # Keyed by the signature so int8 and fp32 vectors are never mixed.
+    embeddings = CachedEmbeddings(
+        base_embeddings,
+        model_name=embedding_signature,
+        max_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", "10000")),
+        disk_path=os.getenv("EMBEDDING_CACHE_PATH", os.path.join("embedding_cache", "embeddings.sqlite3")) or None,
+    )
     db_dir = "chroma_db"
+    # "per_user": one persistent directory per store (legacy layout)
+    # "shared": one persistent client (one SQLite file) for every tenant, one collection
+    #           per store; each collection still keeps its own HNSW segment directory
+    storage_mode = os.getenv("CHROMA_STORAGE_MODE", "per_user")
+    shared_dir = os.getenv("CHROMA_SHARED_DIR", os.path.join(db_dir, "shared"))
+    # Upper bound on the HNSW segments the shared client keeps loaded (LRU evicted).
+    # Without it every tenant index opened stays in memory for the life of the process; 0 disables the limit.
+    chroma_memory_limit_bytes = int(os.getenv("CHROMA_MEMORY_LIMIT_BYTES", str(512 * 1024 * 1024)))
+    # "chroma": query the Chroma/HNSW store; "numpy": brute-force over a float16 matrix
+    retriever_backend = os.getenv("RETRIEVER_BACKEND", "chroma")
+    numpy_index_dir = os.getenv("NUMPY_INDEX_DIR", "numpy_index")
+    # "hybrid": BM25 + vector results fused by reciprocal rank; "vector": vector only
+    retrieval_mode = os.getenv("RETRIEVAL_MODE", "hybrid")
+    bm25_index_dir = os.getenv("BM25_INDEX_DIR", "bm25_index")
+    _shared_client = None
+    _shared_client_lock = threading.Lock()
+    parsing_pool = DocumentParsingPool(
+        workers=int(os.getenv("DOCUMENT_PARSER_WORKERS", "2")),
+        timeout=float(os.getenv("DOCUMENT_PARSER_TIMEOUT", "30")),
+        max_pages=int(os.getenv("DOCUMENT_PARSER_MAX_PAGES", "50")),
+        max_tasks_per_child=int(os.getenv("DOCUMENT_PARSER_MAX_TASKS_PER_CHILD", "50")),
+    )
+    vector_store_cache = VectorStoreCache(
+        max_size=int(os.getenv("VECTOR_STORE_CACHE_SIZE", "128")),
+        idle_ttl=float(os.getenv("VECTOR_STORE_CACHE_IDLE_TTL", "900")),
+    )
         
 
-    @staticmethod
-    def load_document(file_path: str) -> List[Document]:
-        if file_path.endswith('.pdf'):
-            loader = PyPDFLoader(file_path)
-        elif file_path.endswith('.docx'):
-            loader = Docx2txtLoader(file_path)
-        elif file_path.endswith('.html'):
-            loader = UnstructuredHTMLLoader(file_path)
-        else:
+    @classmethod
+    def load_document(cls, file_path: str) -> List[Document]:
+        """Parse a file in the parser process pool (see DocumentParsingPool)."""
+        if not file_path.endswith(('.pdf', '.docx', '.html')):
             raise ValueError(f"Unsupported file type: {file_path}")
-        return loader.load()
+        return cls.parsing_pool.parse(file_path)
 
     @staticmethod
     def add_metadata(documents: List[Document], metadata: dict) -> List[Document]:
@@ -41,39 +110,98 @@ class DocumentProcessingService:
 
     @staticmethod
     def split_documents(documents: List[Document], chunk_size: int = 1000, chunk_overlap: int = 100, strategy: str = "recursive") -> List[Document]:
-        splitter = DocumentProcessingService.get_strategy(strategy)(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        splitter = DocumentProcessingService.get_strategy(strategy)(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap, add_start_index=True
+        )
         
         chunks = splitter.split_documents(documents)
-        # for i, chunk in enumerate(chunks):
-        #     chunk.metadata.update({"chunk_index": i, "chunk_size": len(chunk.page_content)})
+        # chunk_index restores document order when the whole resume is fetched back
+        for i, chunk in enumerate(chunks):
+            chunk.metadata.update({"chunk_index": i, "chunk_size": len(chunk.page_content)})
         # print(f"Total chunks created: {len(chunks)}")
         # print(f"First chunk metadata: {chunks[0].documents if chunks else 'No chunks created'}")
         return chunks
 
+    @staticmethod
+    def chunk_id(chunk: Document) -> str:
+        """Stable id of a chunk, derived from its content only."""
+        return hashlib.sha256(chunk.page_content.encode("utf-8")).hexdigest()
+
     @classmethod
-    def store_documents(cls,docs, store_name):  
-        persistent_directory = os.path.join(cls.db_dir, store_name)
+    def store_documents(cls,docs, store_name) -> dict | None:  
+        """Upsert chunks into the store, embedding only chunks whose content is new.
+
+        Chunks already present keep their vectors and only get their metadata
+        refreshed; chunks missing from ``docs`` are deleted.
+        """
         if not docs:
-            print("ERROR: No documents provided to store!")
+            logger.error("No documents provided to store")
             return
         try :
-            if not os.path.exists(persistent_directory):
-                print(f"\n--- Creating vector store {store_name} ---")
-                db = Chroma.from_documents(
-                    docs, cls.embeddings, 
-                    persist_directory=persistent_directory,
-                    collection_name=store_name
-                )
-                collection = db._collection
-                verification = collection.get(include=['metadatas', 'documents'])
-                print(f"Documents stored: {len(verification['documents'])}")
-                print(f"--- Finished creating vector store {store_name} ---")
+            chunks = {}
+            for doc in docs:
+                chunks.setdefault(cls.chunk_id(doc), doc)
+
+            vector_store = cls.get_vector_store(store_name)
+            collection = vector_store._collection
+            existing_ids = set(collection.get(include=[])["ids"])
+
+            new_ids = [chunk_id for chunk_id in chunks if chunk_id not in existing_ids]
+            kept_ids = [chunk_id for chunk_id in chunks if chunk_id in existing_ids]
+            removed_ids = list(existing_ids - chunks.keys())
+
+            if new_ids:
+                vector_store.add_documents([chunks[chunk_id] for chunk_id in new_ids], ids=new_ids)
+            if kept_ids:
+                collection.update(ids=kept_ids, metadatas=[chunks[chunk_id].metadata for chunk_id in kept_ids])
+            if removed_ids:
+                collection.delete(ids=removed_ids)
+
+            # Side indexes of a setting that is off are deleted rather than left
+            # stale; they are rebuilt from Chroma once the setting is turned on
+            if cls.retriever_backend == "numpy":
+                cls.build_numpy_index(store_name)
             else:
-                print(
-                    f"Vector store {store_name} already exists. No need to initialize.")
+                cls.drop_numpy_index(store_name)
+            if cls.retrieval_mode == "hybrid":
+                cls.build_bm25_index(store_name)
+            else:
+                cls.drop_bm25_index(store_name)
+
+            summary = {"added": len(new_ids), "unchanged": len(kept_ids), "deleted": len(removed_ids)}
+            logger.info("Vector store %s updated", store_name, extra=summary)
+            return summary
         except Exception as e:
-            print(f"ERROR storing documents: {str(e)}")
+            logger.exception("Error storing documents in %s", store_name)
             raise e
+        finally:
+            # Drop any open handle so readers pick up the freshly ingested index
+            cls.vector_store_cache.invalidate(store_name)
+            cls.vector_store_cache.invalidate(f"numpy:{store_name}")
+            cls.vector_store_cache.invalidate(f"bm25:{store_name}")
+
+    @classmethod
+    def build_numpy_index(cls, store_name: str, collection=None) -> bool:
+        """(Re)build the NumPy index of a store from the vectors already stored in Chroma."""
+        collection = collection if collection is not None else cls.get_vector_store(store_name)._collection
+        results = collection.get(include=["embeddings", "documents", "metadatas"])
+        if not results["ids"]:
+            return False
+        NumpyVectorStore.build(
+            os.path.join(cls.numpy_index_dir, store_name),
+            results["ids"], results["documents"], results["metadatas"], results["embeddings"],
+        )
+        return True
+
+    @classmethod
+    def drop_numpy_index(cls, store_name: str) -> None:
+        shutil.rmtree(os.path.join(cls.numpy_index_dir, store_name), ignore_errors=True)
+
+    @classmethod
+    def drop_bm25_index(cls, store_name: str) -> None:
+        path = os.path.join(cls.bm25_index_dir, f"{store_name}.json")
+        if os.path.exists(path):
+            os.remove(path)
         
     
     # @classmethod
@@ -99,21 +227,187 @@ class DocumentProcessingService:
         
     @classmethod
     def get_vector_store(cls, store_name: str):
-        """Get a Chroma vector store for the specified collection."""
-        persistent_directory =  os.path.join(cls.db_dir, store_name)
-        print(f"Persistent directory: {persistent_directory}")
-        # client = chromadb.PersistentClient(path=cls.db_dir)
+        """Get a Chroma vector store for the specified collection (cached while in use)."""
+        return cls.vector_store_cache.get_or_create(
+            store_name, lambda: cls._open_vector_store(store_name)
+        )
+
+    @classmethod
+    def build_bm25_index(cls, store_name: str) -> BM25Index | None:
+        """(Re)build and persist the keyword index of a store from its stored chunks."""
+        results = cls.get_vector_store(store_name)._collection.get(include=["documents", "metadatas"])
+        if not results["ids"]:
+            return None
+        index = BM25Index(results["ids"], results["documents"], results["metadatas"])
+        index.save(os.path.join(cls.bm25_index_dir, f"{store_name}.json"))
+        return index
+
+    @classmethod
+    def get_bm25_index(cls, store_name: str) -> BM25Index | None:
+        def open_index():
+            path = os.path.join(cls.bm25_index_dir, f"{store_name}.json")
+            if os.path.exists(path):
+                return BM25Index.load(path)
+            # Stores ingested before hybrid retrieval get their index on first use
+            return cls.build_bm25_index(store_name)
+
+        index = cls.vector_store_cache.get_or_create(f"bm25:{store_name}", open_index)
+        if index is None:
+            # Do not remember "no index": the store may be ingested any moment
+            cls.vector_store_cache.invalidate(f"bm25:{store_name}")
+        return index
+
+    @classmethod
+    def retrieve_scored(cls, store_name: str, query: str, k: int = 5) -> List[tuple[Document, float]]:
+        """Top-k chunks with a relevance score (higher is better) for the configured retrieval mode.
+
+        In hybrid mode BM25 and vector rankings are merged with reciprocal rank
+        fusion, after cutting the vector ranking at its first sharp distance
+        gap (fused scores carry no such signal); short queries made only of indexed terms skip the query
+        embedding and are answered by BM25 alone.
+        """
+        with stage("bm25_index"):
+            keyword_index = cls.get_bm25_index(store_name) if cls.retrieval_mode == "hybrid" else None
+        if keyword_index is not None and keyword_index.is_keyword_query(query):
+            with stage("keyword_search"):
+                return keyword_index.search(query, k=k)
+
+        with stage("vector_store"):
+            retriever = cls.get_retriever(store_name)
+        with stage("similarity_search"):
+            vector_hits = [
+                (doc, -distance)
+                for doc, distance in retriever.similarity_search_with_score(query, k=k)
+            ]
+        if keyword_index is None:
+            return vector_hits
+        vector_hits = vector_hits[:context_builder.cut_at_score_gap([score for _, score in vector_hits])]
+        with stage("keyword_search"):
+            keyword_hits = keyword_index.search(query, k=k)
+        return reciprocal_rank_fusion([vector_hits, keyword_hits], key=cls.chunk_id, k=k)
+
+    @classmethod
+    def get_retriever(cls, store_name: str):
+        """Search interface (similarity_search[_with_score] and async variants) of the configured backend."""
+        if cls.retriever_backend == "chroma":
+            return cls.get_vector_store(store_name)
+        if cls.retriever_backend == "numpy":
+            return cls.vector_store_cache.get_or_create(
+                f"numpy:{store_name}", lambda: cls._open_numpy_index(store_name)
+            )
+        raise ValueError(f"Unsupported retriever backend: {cls.retriever_backend}")
+
+    @classmethod
+    def _open_numpy_index(cls, store_name: str):
+        index_dir = os.path.join(cls.numpy_index_dir, store_name)
+        # Stores ingested before the backend was switched get their index on first use
+        if not NumpyVectorStore.exists(index_dir) and not cls.build_numpy_index(store_name):
+            # Nothing indexed yet: an empty Chroma store answers with no results
+            return cls.get_vector_store(store_name)
+        return NumpyVectorStore(index_dir, cls.embeddings)
+
+    @classmethod
+    def _open_vector_store(cls, store_name: str):
+        logger.debug("Opening vector store %s (%s)", store_name, cls.storage_mode)
         try:
-            # collection = client.get_collection(name=store_name)
-            return Chroma(
-                # client=client,
+            vector_store = Chroma(
                 collection_name=store_name,
                 embedding_function=cls.embeddings,
-                persist_directory=persistent_directory
+                **cls._chroma_location(store_name)
             )
         except Exception as e:
             raise ValueError(f"Collection {store_name} not found: {str(e)}")
-    
+        if cls.storage_mode == "per_user":
+            # chromadb keeps one System (SQLite connection, loaded segments) per directory
+            # until it is closed. Close it once the cache has dropped the store and the
+            # last in-flight request holding it is done.
+            weakref.finalize(vector_store, cls.close_client, vector_store._client)
+        cls._sync_embedding_model(store_name, vector_store._collection)
+        return vector_store
+
+    @staticmethod
+    def close_client(client) -> None:
+        """Release a Chroma client's System; it is stopped once no other client uses it."""
+        if hasattr(client, "close"):
+            client.close()
+            return
+        # chromadb without Client.close(): drop the cached System ourselves
+        system = SharedSystemClient._identifier_to_system.pop(client._identifier, None)
+        if system is not None:
+            system.stop()
+
+    @classmethod
+    def _sync_embedding_model(cls, store_name: str, collection) -> None:
+        """Re-embed a store indexed with another embedding backend, then record the current one.
+
+        Collections created before the signature was recorded hold fp32 vectors.
+        Chunk texts and metadata are kept, only the vectors are recomputed.
+        """
+        metadata = dict(collection.metadata or {})
+        indexed_with = metadata.get("embedding_model", cls.embedding_model_name)
+        if indexed_with == cls.embedding_signature and "embedding_model" in metadata:
+            return
+
+        results = collection.get(include=["documents", "metadatas"])
+        if results["ids"] and indexed_with != cls.embedding_signature:
+            logger.info("Re-embedding %d chunks of %s (%s -> %s)", len(results["ids"]), store_name,
+                        indexed_with, cls.embedding_signature)
+            collection.update(
+                ids=results["ids"],
+                embeddings=cls.embeddings.embed_documents(results["documents"]),
+            )
+            if cls.retriever_backend == "numpy":
+                cls.build_numpy_index(store_name, collection)
+            else:
+                cls.drop_numpy_index(store_name)
+            cls.vector_store_cache.invalidate(f"numpy:{store_name}")
+
+        # Chroma rejects changes to the distance settings, so only our own key is written
+        metadata = {key: value for key, value in metadata.items() if not key.startswith("hnsw:")}
+        collection.modify(metadata={**metadata, "embedding_model": cls.embedding_signature})
+
+    @classmethod
+    def shared_client_settings(cls) -> Settings:
+        """Chroma settings of the shared client: LRU segment cache bounded by CHROMA_MEMORY_LIMIT_BYTES."""
+        if cls.chroma_memory_limit_bytes <= 0:
+            return Settings()
+        return Settings(
+            chroma_segment_cache_policy="LRU",
+            chroma_memory_limit_bytes=cls.chroma_memory_limit_bytes,
+        )
+
+    @classmethod
+    def get_shared_client(cls):
+        """Return the process-wide Chroma client used in shared storage mode."""
+        if cls._shared_client is None:
+            with cls._shared_client_lock:
+                if cls._shared_client is None:
+                    cls._shared_client = chromadb.PersistentClient(
+                        path=cls.shared_dir, settings=cls.shared_client_settings()
+                    )
+        return cls._shared_client
+
+    @classmethod
+    def _chroma_location(cls, store_name: str) -> dict:
+        """Keyword arguments telling Chroma where the store lives for the active storage mode."""
+        if cls.storage_mode == "shared":
+            return {"client": cls.get_shared_client()}
+        if cls.storage_mode == "per_user":
+            return {"persist_directory": os.path.join(cls.db_dir, store_name)}
+        raise ValueError(f"Unsupported Chroma storage mode: {cls.storage_mode}")
+
+    @classmethod
+    def get_resume_version(cls, store_name: str) -> str | None:
+        """Hash identifying the resume content currently indexed in the store.
+
+        Chunk ids are content hashes, so hashing the sorted ids changes exactly
+        when the indexed text changes. Returns None for an empty store.
+        """
+        ids = cls.get_vector_store(store_name)._collection.get(include=[])["ids"]
+        if not ids:
+            return None
+        return hashlib.sha256("".join(sorted(ids)).encode("utf-8")).hexdigest()
+
     @classmethod
     def get_by_ids(cls, store_name: str, ids) -> dict:
         """Retrieve documents from the vector store by IDs."""
@@ -124,7 +418,7 @@ class DocumentProcessingService:
     @classmethod
     def search_similar(cls, store_name: str, query_text: str, n_results: int = 5) -> dict:
         """Perform a similarity search on the vector store."""
-        vector_store = cls.get_vector_store(store_name)
+        vector_store = cls.get_retriever(store_name)
         results = vector_store.similarity_search_with_score(
             query=query_text,
             k=n_results
@@ -135,6 +429,41 @@ class DocumentProcessingService:
             "scores": [score for doc, score in results]
         }
 
+    @classmethod
+    def get_document_chunks(cls, store_name: str, metadata_filter: dict | None = None) -> List[Document]:
+        """Fetch every chunk of the store in original document order, without a similarity search."""
+        results = cls.get_vector_store(store_name)._collection.get(
+            where=metadata_filter or None, include=["documents", "metadatas"]
+        )
+        chunks = [
+            Document(page_content=text, metadata=metadata or {})
+            for text, metadata in zip(results["documents"], results["metadatas"])
+        ]
+        # Stores indexed before chunk_index existed fall back to page / offset order
+        chunks.sort(key=lambda chunk: (
+            chunk.metadata.get("chunk_index", float("inf")),
+            chunk.metadata.get("page", 0),
+            chunk.metadata.get("start_index", 0),
+        ))
+        return chunks
+
+    @staticmethod
+    def join_chunks(chunks: List[Document], max_overlap: int = 100, min_overlap: int = 10) -> str:
+        """Join ordered chunks into one text, dropping the text repeated by ``chunk_overlap``."""
+        parts: list[str] = []
+        previous = ""
+        for chunk in chunks:
+            text = chunk.page_content
+            overlap = overlap_length(previous, text, max_overlap, min_overlap)
+            if overlap:
+                parts.append(text[overlap:])
+            else:
+                if parts:
+                    parts.append("\n\n")
+                parts.append(text)
+            previous = text
+        return "".join(parts)
+
     @classmethod
     def search_by_metadata(cls, store_name: str, metadata_filter: dict, n_results: int = 5) -> dict:
         """Retrieve documents by metadata filter."""
@@ -0,0 +1,60 @@
+import logging
+from functools import partial
+from typing import Callable, List
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """CPU sentence-transformers encoder, optionally int8 dynamically quantized.
+
+    ``quantize=True`` swaps every nn.Linear for a qint8 dynamic-quantized one
+    (weights stored as int8, activations quantized on the fly). The gain is
+    largest on short texts (queries), where the Linear layers dominate; on
+    full-length chunks attention takes a bigger share. The cosine drift and
+    speedup are measured by ``python -m api.utils.embedding_parity``. Texts are
+    preprocessed like HuggingFaceEmbeddings does, so fp32 vectors match the
+    ones already stored.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 32, quantize: bool = False):
+        # Imported here: sentence-transformers pulls in torch
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.quantize = quantize
+        model = SentenceTransformer(model_name, device="cpu")
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        model.eval()
+        self.model = model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        texts = [text.replace("\n", " ") for text in texts]
+        vectors = self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True, show_progress_bar=False)
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+# name -> factory(model_name, batch_size=...) building the encoder
+BACKENDS: dict[str, Callable[..., Embeddings]] = {
+    "fp32": partial(SentenceTransformerEmbeddings, quantize=False),
+    "int8": partial(SentenceTransformerEmbeddings, quantize=True),
+}
+
+
+def create_embedding_backend(backend: str, model_name: str, batch_size: int = 32, threads: int = 0) -> Embeddings:
+    """Build the named backend; ``threads`` > 0 sets torch's intra-op thread count for the process."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported embedding backend: {backend}. Valid options: {', '.join(BACKENDS)}")
+    if threads > 0:
+        import torch
+        torch.set_num_threads(threads)
+    logger.info("Creating %s embedding backend for %s (batch size %d)", backend, model_name, batch_size)
+    return BACKENDS[backend](model_name, batch_size=batch_size)
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from ..core.metrics import stage
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that never sends the same text to the model twice.
+
+    Vectors are keyed by a SHA-256 of (model name, normalized text) and kept in
+    two tiers, both as float32: an in-memory LRU of NumPy arrays (~1.5 KB per
+    384-dim vector instead of ~12 KB as a list of floats) and an optional
+    on-disk SQLite table of raw bytes. Lists are only built when returning.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_name: str, max_entries: int = 10000, disk_path: str | None = None):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = self._open_disk(disk_path) if disk_path else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _open_disk(path: str) -> sqlite3.Connection:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        conn.commit()
+        return conn
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.split())
+
+    def key(self, text: str) -> str:
+        payload = f"{self.model_name}\0{self.normalize(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self.key(text) for text in texts]
+        vectors: dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for k in keys:
+                if k in vectors:
+                    continue
+                cached = self._memory.get(k)
+                if cached is not None:
+                    self._memory.move_to_end(k)
+                    vectors[k] = cached
+                    self.memory_hits += 1
+
+            pending = [k for k in dict.fromkeys(keys) if k not in vectors]
+            if pending and self._disk is not None:
+                for k, vector in self._read_disk(pending).items():
+                    vectors[k] = vector
+                    self._remember(k, vector)
+                    self.disk_hits += 1
+
+        # Embed each distinct missing text once, outside the lock
+        missing: dict[str, str] = {}
+        for k, text in zip(keys, texts):
+            if k not in vectors and k not in missing:
+                missing[k] = text
+        if missing:
+            with stage("embedding"):
+                computed = self.embeddings.embed_documents(list(missing.values()))
+            with self._lock:
+                self.misses += len(missing)
+                new_vectors = {k: np.asarray(vector, dtype=np.float32) for k, vector in zip(missing.keys(), computed)}
+                for k, vector in new_vectors.items():
+                    vectors[k] = vector
+                    self._remember(k, vector)
+                if self._disk is not None:
+                    self._write_disk(new_vectors)
+
+        return [vectors[k].tolist() for k in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, keys: List[str]) -> dict:
+        found = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._disk.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            for k, blob in rows:
+                found[k] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def _write_disk(self, vectors: dict) -> None:
+        self._disk.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            [(k, v.tobytes()) for k, v in vectors.items()],
+        )
+        self._disk.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "model_name": self.model_name,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
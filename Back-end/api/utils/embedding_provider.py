@@ -0,0 +1,55 @@
+import logging
+import threading
+import time
+from typing import Callable, List
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingProvider:
+    """The process-wide embedding model, loaded once on first use.
+
+    Every component embeds through the same provider, so a worker process
+    holds a single copy of the model. Loading is thread-safe: concurrent
+    first callers wait for one load instead of each building a model.
+    """
+
+    def __init__(self, model_name: str, factory: Callable[[str], Embeddings]):
+        self.model_name = model_name
+        self.factory = factory
+        self._model: Embeddings | None = None
+        self._lock = threading.Lock()
+        self.load_seconds: float | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self) -> Embeddings:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    started = time.perf_counter()
+                    self._model = self.factory(self.model_name)
+                    self.load_seconds = time.perf_counter() - started
+                    logger.info("Loaded embedding model %s in %.2fs", self.model_name, self.load_seconds)
+        return self._model
+
+    def warm_up(self) -> None:
+        """Load the model and run one encode, so the first request pays neither cost."""
+        self.get().embed_query("warm up")
+
+
+class LazyEmbeddings(Embeddings):
+    """Embeddings facade over an EmbeddingProvider; nothing is loaded until the first embed call."""
+
+    def __init__(self, provider: EmbeddingProvider):
+        self.provider = provider
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.provider.get().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.provider.get().embed_query(text)
@@ -0,0 +1,28 @@
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+@contextmanager
+def exclusive_file_lock(path: str):
+    """Hold an exclusive lock on ``path`` across every process of the host (blocks until free).
+
+    Uses flock, so the lock is released by the kernel if the holder dies. On
+    platforms without fcntl this is a no-op and only in-process serialization
+    applies.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
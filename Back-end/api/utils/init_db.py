@@ -2,6 +2,7 @@ from ..core.database import Base, engine
 from ..models.User import User
 from ..models.Resume import Resume
 from ..models.Applicationlogs import ApplicationLog
+from ..models.IngestionJob import IngestionJobRecord
 
 
 def create_tables():
@@ -12,6 +13,7 @@ def create_tables():
     User.metadata.create_all(bind=engine)
     Resume.metadata.create_all(bind=engine)
     ApplicationLog.metadata.create_all(bind=engine)
+    IngestionJobRecord.metadata.create_all(bind=engine)
     
     
   
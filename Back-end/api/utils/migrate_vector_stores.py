@@ -0,0 +1,116 @@
+"""
+Move per-user Chroma directories (chroma_db/resume_<user_id>) into the shared
+multi-tenant client used when CHROMA_STORAGE_MODE=shared.
+
+Stored embeddings are copied as-is, nothing is re-embedded. The copy is an
+upsert, so the command can be re-run safely after an interruption.
+
+Usage (from the Back-end directory):
+    python -m api.utils.migrate_vector_stores [--dry-run] [--delete-source]
+"""
+import argparse
+import os
+import shutil
+
+import chromadb
+
+from .document_processing_service import DocumentProcessingService
+
+
+def find_legacy_stores(db_dir: str, shared_dir: str) -> list[str]:
+    """Return the per-user store directories found under ``db_dir``."""
+    if not os.path.isdir(db_dir):
+        return []
+    stores = []
+    for name in sorted(os.listdir(db_dir)):
+        path = os.path.join(db_dir, name)
+        if not os.path.isdir(path) or os.path.abspath(path) == os.path.abspath(shared_dir):
+            continue
+        if name.startswith("resume_"):
+            stores.append(name)
+    return stores
+
+
+def migrate_store(source_path: str, target_client, batch_size: int = 500, dry_run: bool = False) -> int:
+    """Copy every collection of a per-user directory into ``target_client``. Returns the number of records copied."""
+    source_client = chromadb.PersistentClient(path=source_path)
+    try:
+        return _copy_collections(source_client, target_client, batch_size, dry_run)
+    finally:
+        # chromadb caches one System per path; without this every migrated
+        # store would keep its SQLite handle and segments open until exit
+        DocumentProcessingService.close_client(source_client)
+
+
+def _copy_collections(source_client, target_client, batch_size: int, dry_run: bool) -> int:
+    copied = 0
+    for entry in source_client.list_collections():
+        # Newer chromadb versions return names, older ones return Collection objects
+        name = getattr(entry, "name", entry)
+        source = source_client.get_collection(name=name)
+        total = source.count()
+        if dry_run:
+            print(f"  would copy {total} records from collection {name}")
+            copied += total
+            continue
+
+        target = target_client.get_or_create_collection(name=name, metadata=source.metadata or None)
+        for offset in range(0, total, batch_size):
+            batch = source.get(
+                offset=offset,
+                limit=batch_size,
+                include=["embeddings", "documents", "metadatas"],
+            )
+            if not batch["ids"]:
+                break
+            target.upsert(
+                ids=batch["ids"],
+                embeddings=batch["embeddings"],
+                documents=batch["documents"],
+                metadatas=batch["metadatas"],
+            )
+            copied += len(batch["ids"])
+
+        if target.count() < total:
+            raise RuntimeError(f"Collection {name}: copied {target.count()} of {total} records")
+        print(f"  copied {total} records from collection {name}")
+    return copied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate per-user Chroma directories into the shared client.")
+    parser.add_argument("--db-dir", default=DocumentProcessingService.db_dir)
+    parser.add_argument("--shared-dir", default=DocumentProcessingService.shared_dir)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be copied")
+    parser.add_argument("--delete-source", action="store_true", help="Remove each per-user directory once copied")
+    args = parser.parse_args(argv)
+
+    stores = find_legacy_stores(args.db_dir, args.shared_dir)
+    print(f"Found {len(stores)} per-user stores in {args.db_dir}")
+    target_client = None if args.dry_run else chromadb.PersistentClient(
+        path=args.shared_dir, settings=DocumentProcessingService.shared_client_settings()
+    )
+
+    migrated, failed = 0, []
+    for store_name in stores:
+        source_path = os.path.join(args.db_dir, store_name)
+        print(f"Migrating {store_name}")
+        try:
+            migrate_store(source_path, target_client, args.batch_size, args.dry_run)
+        except Exception as e:
+            print(f"  ERROR migrating {store_name}: {e}")
+            failed.append(store_name)
+            continue
+        migrated += 1
+        if args.delete_source and not args.dry_run:
+            shutil.rmtree(source_path)
+
+    print(f"Migrated {migrated} stores, {len(failed)} failed")
+    if failed:
+        print("Failed stores: " + ", ".join(failed))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
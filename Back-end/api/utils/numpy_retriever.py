@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import shutil
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+
+class NumpyVectorStore:
+    """Brute-force retriever for small per-user indexes.
+
+    A resume yields a few dozen chunks, so one matrix-vector product over a
+    memory-mapped float16 matrix answers top-k faster than an HNSW index.
+    Scores are squared L2 distances between unit vectors (2 - 2 * cosine),
+    the same scale Chroma reports, so callers can switch backends freely.
+    """
+
+    VECTORS_FILE = "vectors.f16.npy"
+    CHUNKS_FILE = "chunks.json"
+
+    def __init__(self, index_dir: str, embeddings: Embeddings):
+        self.index_dir = index_dir
+        self.embeddings = embeddings
+        with open(os.path.join(index_dir, self.CHUNKS_FILE), encoding="utf-8") as f:
+            chunks = json.load(f)
+        self.ids: list[str] = chunks["ids"]
+        self.documents: list[str] = chunks["documents"]
+        self.metadatas: list[dict] = chunks["metadatas"]
+        self.vectors = np.load(os.path.join(index_dir, self.VECTORS_FILE), mmap_mode="r")
+
+    @classmethod
+    def exists(cls, index_dir: str) -> bool:
+        return os.path.exists(os.path.join(index_dir, cls.CHUNKS_FILE))
+
+    @classmethod
+    def build(cls, index_dir: str, ids: list[str], documents: list[str], metadatas: list[dict], vectors) -> None:
+        """Write an index from already computed embeddings, replacing any previous one."""
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = (matrix / np.where(norms == 0, 1, norms)).astype(np.float16)
+
+        tmp_dir = f"{index_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        np.save(os.path.join(tmp_dir, cls.VECTORS_FILE), matrix)
+        with open(os.path.join(tmp_dir, cls.CHUNKS_FILE), "w", encoding="utf-8") as f:
+            json.dump({"ids": list(ids), "documents": list(documents), "metadatas": list(metadatas)}, f)
+
+        old_dir = f"{index_dir}.old"
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.exists(index_dir):
+            os.replace(index_dir, old_dir)
+        os.replace(tmp_dir, index_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    def similarity_search_by_vector_with_score(self, embedding, k: int = 4) -> List[tuple[Document, float]]:
+        if not self.ids:
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        similarities = self.vectors @ query
+        k = min(k, len(self.ids))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [
+            (Document(page_content=self.documents[i], metadata=self.metadatas[i] or {}),
+             float(2.0 - 2.0 * similarities[i]))
+            for i in top
+        ]
+
+    def similarity_search_with_score(self, query: str, k: int = 4) -> List[tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self.embeddings.embed_query(query), k=k)
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k)]
+
+    async def asimilarity_search_with_score(self, query: str, k: int = 4) -> List[tuple[Document, float]]:
+        return await asyncio.get_running_loop().run_in_executor(None, self.similarity_search_with_score, query, k)
+
+    async def asimilarity_search(self, query: str, k: int = 4) -> List[Document]:
+        return [doc for doc, _ in await self.asimilarity_search_with_score(query, k=k)]
@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Hashable
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class ResponseCache:
+    """TTL + LRU cache of generated answers for resume-level services.
+
+    Keys are tuples starting with the user id, e.g.
+    (user_id, resume_version, service_type, prompt_version), which lets a new
+    upload drop every answer of that user at once.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 86400.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: dict[str, int] = defaultdict(int)
+        self.misses: dict[str, int] = defaultdict(int)
+        self.tokens_avoided = 0
+        self.evictions = 0
+
+    def get(self, key: tuple, service_type: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[2] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses[service_type] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits[service_type] += 1
+            self.tokens_avoided += entry[1]
+            return entry[0]
+
+    def set(self, key: tuple, value: Any, tokens: int = 0) -> None:
+        """Store an answer; ``tokens`` is what producing it cost, counted again on every hit."""
+        with self._lock:
+            self._entries[key] = (value, tokens, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = sum(self.hits.values()), sum(self.misses.values())
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "llm_calls_avoided": hits,
+                "llm_tokens_avoided": self.tokens_avoided,
+                "evictions": self.evictions,
+                "by_service": {
+                    service: {"hits": self.hits[service], "misses": self.misses[service]}
+                    for service in sorted(set(self.hits) | set(self.misses))
+                },
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "86400")),
+)
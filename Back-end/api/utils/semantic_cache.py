@@ -0,0 +1,125 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class _UserAnswers:
+    """Fixed-capacity store of one user's cached answers, scanned as a single matrix."""
+
+    def __init__(self, capacity: int, dim: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.versions: list[str | None] = [None] * capacity
+        self.answers: list[str | None] = [None] * capacity
+        self.last_used = np.zeros(capacity, dtype=np.int64)
+        self.size = 0
+
+
+class SemanticAnswerCache:
+    """Per-user cache answering near-duplicate questions without the LLM.
+
+    A lookup is one matrix-vector product over the user's unit-normalized
+    question embeddings; the best match is returned when its cosine similarity
+    reaches ``threshold`` and it was produced for the current resume version.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries_per_user: int = 64, max_users: int = 10000):
+        self.threshold = threshold
+        self.max_entries_per_user = max_entries_per_user
+        self.max_users = max_users
+        self._users: "OrderedDict[int, _UserAnswers]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._tick = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, user_id: int, question_vector, resume_version: str) -> str | None:
+        query = self._normalize(question_vector)
+        with self._lock:
+            entries = self._users.get(user_id)
+            if entries is None or entries.size == 0:
+                self.misses += 1
+                return None
+            similarities = entries.vectors[:entries.size] @ query
+            stale = [i for i in range(entries.size) if entries.versions[i] != resume_version]
+            similarities[stale] = -1.0
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.misses += 1
+                return None
+            self._tick += 1
+            entries.last_used[best] = self._tick
+            self._users.move_to_end(user_id)
+            self.hits += 1
+            return entries.answers[best]
+
+    def store(self, user_id: int, question_vector, answer: str, resume_version: str) -> None:
+        vector = self._normalize(question_vector)
+        with self._lock:
+            entries = self._users.get(user_id)
+            if entries is None or entries.vectors.shape[1] != vector.shape[0]:
+                entries = _UserAnswers(self.max_entries_per_user, vector.shape[0])
+                self._users[user_id] = entries
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+            self._drop_stale(entries, resume_version)
+            if entries.size < self.max_entries_per_user:
+                slot = entries.size
+                entries.size += 1
+            else:
+                slot = int(np.argmin(entries.last_used[:entries.size]))
+            self._tick += 1
+            entries.vectors[slot] = vector
+            entries.answers[slot] = answer
+            entries.versions[slot] = resume_version
+            entries.last_used[slot] = self._tick
+
+    @staticmethod
+    def _drop_stale(entries: _UserAnswers, resume_version: str) -> None:
+        """Compact the user's entries, keeping only those of ``resume_version``."""
+        keep = [i for i in range(entries.size) if entries.versions[i] == resume_version]
+        if len(keep) == entries.size:
+            return
+        n = len(keep)
+        entries.vectors[:n] = entries.vectors[keep]
+        entries.last_used[:n] = entries.last_used[keep]
+        entries.answers[:n] = [entries.answers[i] for i in keep]
+        entries.versions[:n] = [entries.versions[i] for i in keep]
+        for i in range(n, entries.size):
+            entries.answers[i] = entries.versions[i] = None
+        entries.size = n
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "users": len(self._users),
+                "entries": sum(entries.size for entries in self._users.values()),
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+semantic_cache = SemanticAnswerCache(
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+    max_entries_per_user=int(os.getenv("SEMANTIC_CACHE_PER_USER", "64")),
+    max_users=int(os.getenv("SEMANTIC_CACHE_MAX_USERS", "10000")),
+)
@@ -0,0 +1,14 @@
+import json
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # Stop nginx-style proxies from buffering the event stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(event: str, data) -> str:
+    """Encode one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -0,0 +1,77 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+from ..schemas.User_schema import AuthenticatedUser
+
+load_dotenv()
+
+
+class UserCache:
+    """TTL + LRU cache of authenticated users keyed by email.
+
+    Entries are detached pydantic copies of the user row, so they can be shared
+    between requests and sessions. Anything that changes a user must call
+    ``invalidate`` with its email; the TTL bounds staleness for the rest.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[AuthenticatedUser, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, email: str) -> AuthenticatedUser | None:
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[email]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, email: str, user: AuthenticatedUser) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[email] = (user, time.monotonic())
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, email: str) -> None:
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+user_cache = UserCache(
+    max_entries=int(os.getenv("USER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "60")),
+)
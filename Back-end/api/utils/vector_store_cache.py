@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+class VectorStoreCache:
+    """Bounded, thread-safe LRU cache of open vector stores keyed by store name.
+
+    Entries are evicted when the cache grows beyond ``max_size`` or when a
+    store has not been used for ``idle_ttl`` seconds. Stores are opened
+    outside the cache lock, under a per-name lock, so a slow open or index
+    build only blocks callers waiting for that same store.
+
+    The cache only drops its reference: releasing what a store holds (e.g. a
+    per-directory Chroma System) is up to the store's owner, see
+    DocumentProcessingService._open_vector_store.
+    """
+
+    def __init__(self, max_size: int = 128, idle_ttl: float = 900.0):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self._stores: "OrderedDict[str, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._open_locks: dict[str, threading.Lock] = {}
+        # Bumped by invalidate()/clear(), so a store opened before them is not cached after them
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_create(self, store_name: str, factory: Callable[[], Any]) -> Any:
+        """Return the cached store for ``store_name``, opening it with ``factory`` on a miss."""
+        store = self._lookup(store_name)
+        if store is not None:
+            return store
+
+        with self._lock:
+            open_lock = self._open_locks.setdefault(store_name, threading.Lock())
+        with open_lock:
+            # Another caller may have opened it while we waited for the lock
+            store = self._lookup(store_name)
+            if store is not None:
+                return store
+            with self._lock:
+                self.misses += 1
+                generation = (self._epoch, self._generations.get(store_name, 0))
+            try:
+                store = factory()
+                with self._lock:
+                    if (self._epoch, self._generations.get(store_name, 0)) == generation:
+                        self._stores[store_name] = (store, time.monotonic())
+                        while len(self._stores) > self.max_size:
+                            self._stores.popitem(last=False)
+                            self.evictions += 1
+            finally:
+                with self._lock:
+                    if self._open_locks.get(store_name) is open_lock:
+                        del self._open_locks[store_name]
+            return store
+
+    def _lookup(self, store_name: str) -> Any:
+        with self._lock:
+            now = time.monotonic()
+            self._evict_idle(now)
+            entry = self._stores.get(store_name)
+            if entry is None:
+                return None
+            self.hits += 1
+            self._stores[store_name] = (entry[0], now)
+            self._stores.move_to_end(store_name)
+            return entry[0]
+
+    def invalidate(self, store_name: str) -> None:
+        """Drop the cached store so the next lookup reopens it (e.g. after re-ingest)."""
+        with self._lock:
+            self._stores.pop(store_name, None)
+            self._generations[store_name] = self._generations.get(store_name, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stores.clear()
+            self._epoch += 1
+
+    def _evict_idle(self, now: float) -> None:
+        if self.idle_ttl <= 0:
+            return
+        # Entries are kept in access order, so idle ones are always at the front.
+        while self._stores:
+            name, (_, last_used) = next(iter(self._stores.items()))
+            if now - last_used < self.idle_ttl:
+                break
+            del self._stores[name]
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._stores),
+                "max_size": self.max_size,
+                "idle_ttl": self.idle_ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
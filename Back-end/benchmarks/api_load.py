@@ -0,0 +1,286 @@
+"""
+End-to-end load benchmark of the resume API, run in-process.
+
+The FastAPI app is driven through httpx's ASGI transport by concurrent
+clients. It uses a throw-away SQLite database and vector stores in a temporary
+directory, and ChatGoogleGenerativeAI is replaced by a deterministic stub
+with configurable latency. The embedding model, parsers, retrieval and caches
+are the real ones.
+
+Scenarios:
+- login: bcrypt verification under concurrency.
+- upload_<format>_<size>: upload of a synthetic PDF/DOCX/HTML resume until
+  its ingestion job has finished.
+- ask, ask_stream, rate and pipeline_<service>: one run per --concurrency level.
+
+Each scenario reports throughput, p50/p95/p99 latency, errors and its peak
+RSS: on Linux the high-water mark is reset before every scenario, elsewhere
+it is the process's peak so far ("peak_rss_scope"). The output is JSON, meant to be diffed between
+commits.
+
+Usage (from the Back-end directory):
+    python -m benchmarks.api_load [--users 8] [--requests 64] [--concurrency 1 8 32]
+                                  [--llm-latency 0.2] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from .synthetic_resumes import FORMATS, SIZES, generate_resume
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTIONS = [
+    "What programming languages does this candidate know?",
+    "Summarize the candidate's most recent role.",
+    "Has the candidate worked with Kubernetes?",
+    "Which companies has the candidate worked for?",
+    "What measurable results are listed in the experience section?",
+    "Does the candidate have cloud experience?",
+    "What is the candidate's education?",
+    "Which data engineering tools appear in the resume?",
+]
+PASSWORD = "benchmark-password"
+
+
+def reset_peak_rss() -> bool:
+    """Reset the process's RSS high-water mark (VmHWM); False where the kernel does not support it."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS since the last reset_peak_rss(), or over the process lifetime without /proc."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(name: str, latencies: list[float], errors: int, elapsed: float, concurrency: int,
+              rss_reset: bool = False) -> dict:
+    summary = {
+        "scenario": name,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_rss_scope": "scenario" if rss_reset else "process",
+    }
+    if latencies:
+        ms = np.asarray(latencies) * 1000
+        summary["latency_ms"] = {
+            "mean": round(float(ms.mean()), 2),
+            "p50": round(float(np.percentile(ms, 50)), 2),
+            "p95": round(float(np.percentile(ms, 95)), 2),
+            "p99": round(float(np.percentile(ms, 99)), 2),
+            "max": round(float(ms.max()), 2),
+        }
+    return summary
+
+
+async def run_scenario(name: str, requests: int, concurrency: int, make_request) -> dict:
+    """Run ``make_request(i)`` for i in range(requests) with ``concurrency`` clients.
+
+    ``make_request`` returns True on success; its wall time is the latency.
+    """
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async def client():
+        nonlocal next_index, errors
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            started = time.perf_counter()
+            try:
+                ok = await make_request(index)
+            except Exception:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    rss_reset = reset_peak_rss()
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(max(1, min(concurrency, requests)))))
+    return summarize(name, latencies, errors, time.perf_counter() - started, concurrency, rss_reset)
+
+
+async def wait_for_job(client, headers: dict, status_url: str, poll_interval: float = 0.05) -> bool:
+    while True:
+        response = await client.get(status_url, headers=headers)
+        if response.status_code != 200:
+            return False
+        status = response.json()["status"]
+        if status in ("succeeded", "failed"):
+            return status == "succeeded"
+        await asyncio.sleep(poll_interval)
+
+
+async def run(args, workdir: str) -> list[dict]:
+    import httpx
+
+    from api.core.lifecycle import readiness, warm_up
+    from api.utils.init_db import create_tables
+    from benchmarks.stub_llm import install_stub_chat_model
+
+    install_stub_chat_model(latency=args.llm_latency, token_latency=args.llm_token_latency)
+    import main as app_module  # after the stub is installed: the routers grab the chat model on import
+
+    create_tables()
+    # httpx's ASGI transport does not run the lifespan; warm up here so uploads don't pay for it
+    warm_up()
+    if not readiness.ready:
+        raise RuntimeError(f"Warm-up failed: {readiness.error}")
+    transport = httpx.ASGITransport(app=app_module.app)
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        emails = [f"user{i}@bench.example.com" for i in range(args.users)]
+        for i, email in enumerate(emails):
+            response = await client.post("/authentication/register", params={
+                "username": f"user{i}", "email": email, "password": PASSWORD,
+            })
+            response.raise_for_status()
+
+        tokens: list[str] = [""] * args.users
+
+        async def login(i):
+            user = i % args.users
+            response = await client.post("/authentication/login",
+                                         data={"username": emails[user], "password": PASSWORD})
+            if response.status_code == 200:
+                tokens[user] = response.json()["access_token"]
+            return response.status_code == 200
+
+        results.append(await run_scenario("login", max(args.users, args.requests // 2),
+                                          max(args.concurrency), login))
+        headers = [{"Authorization": f"Bearer {token}"} for token in tokens]
+
+        resume_dir = os.path.join(workdir, "synthetic")
+        for file_format in args.formats:
+            for size in args.sizes:
+                paths = [generate_resume(os.path.join(resume_dir, str(i)), file_format, size, seed=i)
+                         for i in range(args.users)]
+
+                async def upload(i, paths=paths):
+                    with open(paths[i], "rb") as f:
+                        response = await client.post("/resume/upload", headers=headers[i],
+                                                     files={"file": (os.path.basename(paths[i]), f.read())})
+                    if response.status_code != 202:
+                        return False
+                    return await wait_for_job(client, headers[i], response.json()["status_url"])
+
+                results.append(await run_scenario(f"upload_{file_format}_{size}", args.users,
+                                                  max(args.concurrency), upload))
+
+        async def ask(i):
+            response = await client.get("/resume/ask", headers=headers[i % args.users],
+                                        params={"question": QUESTIONS[i % len(QUESTIONS)]})
+            return response.status_code == 200 and response.json().get("status") == "success"
+
+        async def ask_stream(i):
+            response = await client.get("/resume/ask/stream", headers=headers[i % args.users],
+                                        params={"question": QUESTIONS[i % len(QUESTIONS)]})
+            return response.status_code == 200 and "event: done" in response.text
+
+        async def rate(i):
+            response = await client.get("/resume/rate", headers=headers[i % args.users])
+            return response.status_code == 200 and response.json().get("status") == "success"
+
+        async def pipeline(i):
+            response = await client.get("/resume/service/suggest_improvements/pipeline",
+                                        headers=headers[i % args.users])
+            return response.status_code == 200 and response.json().get("status") == "success"
+
+        for concurrency in args.concurrency:
+            for name, make_request in (("ask", ask), ("ask_stream", ask_stream), ("rate", rate),
+                                       ("pipeline_suggest_improvements", pipeline)):
+                results.append(await run_scenario(name, args.requests, concurrency, make_request))
+    return results
+
+
+def configure_environment(workdir: str, args) -> None:
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}",
+        "SECRET_KEY": "benchmark-secret",
+        "ALGORITHM": "HS256",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+    })
+    if args.disable_answer_caches:
+        # Every ask/rate/pipeline request then reaches retrieval and the (stub) model
+        os.environ["RESPONSE_CACHE_TTL"] = "0"
+        os.environ["SEMANTIC_CACHE_THRESHOLD"] = "2"
+    # Vector stores, indexes, uploads and the embedding cache live in relative paths
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(workdir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=64, help="requests per query scenario")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="stub model seconds per call")
+    parser.add_argument("--llm-token-latency", type=float, default=0.0, help="stub model seconds per token")
+    parser.add_argument("--disable-answer-caches", action="store_true",
+                        help="turn off the response and semantic caches")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output) if args.output else None
+    with tempfile.TemporaryDirectory(prefix="api-load-", ignore_cleanup_errors=True) as workdir:
+        configure_environment(workdir, args)
+        started = time.perf_counter()
+        results = asyncio.run(run(args, workdir))
+        os.chdir(BACKEND_DIR)
+
+    report = {
+        "benchmark": "api_load",
+        "commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "total_duration_s": round(time.perf_counter() - started, 2),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
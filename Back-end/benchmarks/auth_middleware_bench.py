@@ -0,0 +1,159 @@
+"""
+Requests per second through the auth middleware: the previous
+BaseHTTPMiddleware implementation vs the pure ASGI one.
+
+Both wrap the same trivial "ok" endpoint and are called directly as ASGI
+apps in a loop (no server, no sockets), so the numbers isolate middleware
+overhead. Scenarios cover a public path, a protected path with a valid
+token, and a rejected request without a token.
+
+Usage (from the Back-end directory):
+    python -m benchmarks.auth_middleware_bench [--requests 20000] [--repeat 3]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import time
+
+# JwtService reads its settings at construction; give the benchmark its own.
+# The api imports build the database engines, which no scenario touches: use in-memory SQLite.
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ["DATABASE_URL"] = "sqlite://"
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from api.core.middlewares import AuthMiddleware
+from api.services.jwt_service import JwtService
+
+LEGACY_PUBLIC_PATHS = [
+    "/",
+    "/authentication/login",
+    "/authentication/register",
+    "/openapi.json",
+    "/docs",
+    "/docs/oauth2-redirect",
+    "/redoc",
+]
+
+_jwt_service = JwtService()
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """The middleware as it was before the pure ASGI rewrite"""
+
+    async def dispatch(self, request, call_next):
+        if request.url.path in LEGACY_PUBLIC_PATHS:
+            print("Public path accessed:", request.url.path)
+            return await call_next(request)
+
+        try:
+            token = request.headers.get("Authorization")
+            if not token or not token.startswith("Bearer "):
+                raise HTTPException(
+                    status_code=401,
+                    detail="Missing or invalid Authorization header",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            token = token.split(" ")[1]
+            _jwt_service.decode_jwt(token)
+        except HTTPException as e:
+            return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+
+        return await call_next(request)
+
+
+def make_scope(path: str, headers: list[tuple[bytes, bytes]]) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+
+
+async def call(app, scope: dict) -> int:
+    status = 0
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(dict(scope), receive, send)
+    return status
+
+
+async def measure(app, scope: dict, requests: int, expected_status: int) -> float:
+    for _ in range(min(200, requests)):  # warm-up
+        await call(app, scope)
+    started = time.perf_counter()
+    for _ in range(requests):
+        status = await call(app, scope)
+        if status != expected_status:
+            raise RuntimeError(f"{scope['path']}: expected {expected_status}, got {status}")
+    return requests / (time.perf_counter() - started)
+
+
+async def run(requests: int, repeat: int) -> list[dict]:
+    endpoint = PlainTextResponse("ok")
+    apps = {
+        "base_http_middleware": LegacyAuthMiddleware(endpoint),
+        "pure_asgi": AuthMiddleware(endpoint),
+    }
+    token = _jwt_service.create_access_token(data={"sub": "bench@example.com"}).access_token
+    scenarios = [
+        ("public", make_scope("/docs", []), 200),
+        ("protected", make_scope("/resume/ask", [(b"authorization", f"Bearer {token}".encode())]), 200),
+        ("rejected", make_scope("/resume/ask", []), 401),
+    ]
+
+    results = []
+    for name, scope, expected_status in scenarios:
+        rps = {}
+        for label, app in apps.items():
+            # The legacy middleware prints on public paths; keep that cost out of the terminal
+            with contextlib.redirect_stdout(io.StringIO()):
+                rps[label] = max([await measure(app, scope, requests, expected_status) for _ in range(repeat)])
+        results.append({
+            "scenario": name,
+            "requests": requests,
+            "requests_per_second": {label: round(value, 1) for label, value in rps.items()},
+            "speedup": round(rps["pure_asgi"] / rps["base_http_middleware"], 2),
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario, the best one is reported")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.requests, args.repeat))
+    print(json.dumps({"benchmark": "auth_middleware", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Top-k latency of the Chroma/HNSW store vs the NumPy brute-force retriever.
+
+Both backends are fed the same random unit vectors (MiniLM dimension) and
+queried by vector, so the numbers isolate retrieval from query embedding.
+Each backend is opened once, as the vector-store cache does in the API.
+
+Usage (from the Back-end directory):
+    python -m benchmarks.retriever_latency [--chunks 5 30 200] [--queries 500] [--k 5]
+"""
+import argparse
+import json
+import tempfile
+import time
+
+import chromadb
+import numpy as np
+
+from api.utils.numpy_retriever import NumpyVectorStore
+
+DIMENSION = 384
+
+
+def percentile_ms(samples: list[float], q: float) -> float:
+    return round(float(np.percentile(samples, q)) * 1000, 4)
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "mean_ms": round(float(np.mean(samples)) * 1000, 4),
+        "p50_ms": percentile_ms(samples, 50),
+        "p95_ms": percentile_ms(samples, 95),
+        "p99_ms": percentile_ms(samples, 99),
+    }
+
+
+def random_unit_vectors(rng, n: int) -> np.ndarray:
+    vectors = rng.standard_normal((n, DIMENSION)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def run_scenario(workdir: str, chunk_count: int, query_count: int, k: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    vectors = random_unit_vectors(rng, chunk_count)
+    queries = random_unit_vectors(rng, query_count)
+    ids = [f"chunk-{i}" for i in range(chunk_count)]
+    documents = [f"resume chunk {i}" for i in range(chunk_count)]
+    metadatas = [{"chunk_index": i} for i in range(chunk_count)]
+
+    client = chromadb.PersistentClient(path=f"{workdir}/chroma_{chunk_count}")
+    collection = client.get_or_create_collection(name=f"resume_{chunk_count}")
+    collection.add(ids=ids, embeddings=vectors.tolist(), documents=documents, metadatas=metadatas)
+
+    index_dir = f"{workdir}/numpy_{chunk_count}"
+    NumpyVectorStore.build(index_dir, ids, documents, metadatas, vectors)
+    numpy_store = NumpyVectorStore(index_dir, embeddings=None)
+
+    chroma_samples, numpy_samples, overlaps = [], [], []
+    for query in queries:
+        started = time.perf_counter()
+        chroma_result = collection.query(query_embeddings=[query.tolist()], n_results=min(k, chunk_count))
+        chroma_samples.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        numpy_result = numpy_store.similarity_search_by_vector_with_score(query, k=k)
+        numpy_samples.append(time.perf_counter() - started)
+
+        chroma_ids = {documents.index(text) for text in chroma_result["documents"][0]}
+        numpy_ids = {documents.index(doc.page_content) for doc, _ in numpy_result}
+        overlaps.append(len(chroma_ids & numpy_ids) / max(len(chroma_ids), 1))
+
+    chroma_summary, numpy_summary = summarize(chroma_samples), summarize(numpy_samples)
+    return {
+        "chunks": chunk_count,
+        "queries": query_count,
+        "k": k,
+        "chroma": chroma_summary,
+        "numpy": numpy_summary,
+        "speedup_p50": round(chroma_summary["p50_ms"] / numpy_summary["p50_ms"], 2) if numpy_summary["p50_ms"] else None,
+        "top_k_agreement": round(float(np.mean(overlaps)), 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, nargs="+", default=[5, 30, 200])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [run_scenario(workdir, n, args.queries, args.k, args.seed) for n in args.chunks]
+    print(json.dumps({"benchmark": "retriever_latency", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cold-start cost of the API process: import time and RSS of `main`, then the
+time and RSS added by the warm-up (embedding model load + first encode).
+
+Each run is a fresh interpreter, so nothing is shared between runs. The chat
+model is the local stub, so the numbers do not depend on network access.
+Medians over --runs are reported as JSON, meant to be diffed between commits.
+
+Usage (from the Back-end directory):
+    python -m benchmarks.startup [--runs 5] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from .api_load import BACKEND_DIR, git_commit
+
+CHILD = r"""
+import json, os, resource, sys, time
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+started = time.perf_counter()
+import main
+import_seconds = time.perf_counter() - started
+rss_after_import = rss_mb()
+
+from benchmarks.stub_llm import install_stub_chat_model
+from api.core.lifecycle import readiness, warm_up
+install_stub_chat_model(latency=0.0)
+started = time.perf_counter()
+warm_up()
+warmup_seconds = time.perf_counter() - started
+
+print(json.dumps({
+    "import_seconds": import_seconds,
+    "rss_after_import_mb": rss_after_import,
+    "warmup_seconds": warmup_seconds,
+    "rss_after_warmup_mb": rss_mb(),
+    "ready": readiness.ready,
+}))
+"""
+
+
+def run_once(workdir: str) -> dict:
+    env = {
+        **os.environ,
+        "PYTHONPATH": BACKEND_DIR,
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'startup.sqlite3')}",
+        "SECRET_KEY": os.getenv("SECRET_KEY", "benchmark-secret"),
+        "ACCESS_TOKEN_EXPIRE_MINUTES": os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"),
+        "LOG_LEVEL": "WARNING",
+    }
+    result = subprocess.run([sys.executable, "-c", CHILD], cwd=workdir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup run failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="startup-", ignore_cleanup_errors=True) as workdir:
+        runs = [run_once(workdir) for _ in range(args.runs)]
+
+    report = {
+        "benchmark": "startup",
+        "commit": git_commit(),
+        "runs": args.runs,
+        "median": {
+            key: round(statistics.median(run[key] for run in runs), 3)
+            for key in ("import_seconds", "rss_after_import_mb", "warmup_seconds", "rss_after_warmup_mb")
+        },
+        "all_ready": all(run["ready"] for run in runs),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
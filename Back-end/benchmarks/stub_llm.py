@@ -0,0 +1,77 @@
+"""
+Deterministic local stand-in for ChatGoogleGenerativeAI.
+
+Answers are derived from a hash of the prompt, so the same request always gets
+the same answer, and every call waits ``latency`` seconds (plus
+``token_latency`` per streamed token) to model provider time without network
+access or API keys. Token usage is reported like a real chat model, so
+usage-based metrics and caches behave as in production.
+"""
+import asyncio
+import hashlib
+import time
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_VOCABULARY = ["the", "resume", "shows", "strong", "experience", "in", "backend", "systems", "with",
+               "clear", "impact", "consider", "adding", "metrics", "to", "each", "role", "and",
+               "highlighting", "leadership", "skills", "such", "as", "python", "cloud", "data"]
+
+
+class StubChatModel(BaseChatModel):
+    latency: float = 0.2
+    token_latency: float = 0.0
+    answer_tokens: int = 60
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat-model"
+
+    def _answer(self, messages: list[BaseMessage]) -> tuple[list[str], dict]:
+        prompt = "\n".join(str(message.content) for message in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        words = [_VOCABULARY[digest[i % len(digest)] % len(_VOCABULARY)] for i in range(self.answer_tokens)]
+        input_tokens = max(1, len(prompt) // 4)
+        usage = {"input_tokens": input_tokens, "output_tokens": len(words),
+                 "total_tokens": input_tokens + len(words)}
+        return words, usage
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        words, usage = self._answer(messages)
+        time.sleep(self.latency + self.token_latency * len(words))
+        message = AIMessage(content=" ".join(words), usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        words, usage = self._answer(messages)
+        await asyncio.sleep(self.latency + self.token_latency * len(words))
+        message = AIMessage(content=" ".join(words), usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        words, usage = self._answer(messages)
+        time.sleep(self.latency)
+        for word in words:
+            time.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage))
+
+    async def _astream(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        words, usage = self._answer(messages)
+        await asyncio.sleep(self.latency)
+        for word in words:
+            await asyncio.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=usage))
+
+
+def install_stub_chat_model(**options) -> StubChatModel:
+    """Make get_chat_model() return a StubChatModel; call before the routers are imported."""
+    from api.services import llm_client
+
+    model = StubChatModel(**options)
+    llm_client._chat_model = model
+    return model
@@ -0,0 +1,154 @@
+"""
+Deterministic synthetic resumes in the formats the upload endpoint accepts.
+
+The same (size, seed) always yields the same text, so runs on different
+commits ingest identical documents. PDFs are written by hand (one Helvetica
+text stream per page) to avoid a PDF-writing dependency; DOCX files use
+python-docx, which the loaders already require.
+
+Usage (from the Back-end directory):
+    python -m benchmarks.synthetic_resumes --out /tmp/resumes
+"""
+import argparse
+import html
+import os
+import random
+import textwrap
+
+from docx import Document as DocxDocument
+
+# Work-experience entries per resume size
+SIZES = {"small": 2, "medium": 8, "large": 30}
+FORMATS = ("pdf", "docx", "html")
+
+_FIRST_NAMES = ["Amina", "Youssef", "Sara", "Omar", "Lina", "Karim", "Nadia", "Hamza"]
+_LAST_NAMES = ["Benali", "El Amrani", "Lasri", "Haddad", "Tazi", "Alaoui", "Berrada", "Idrissi"]
+_TITLES = ["Backend Engineer", "Data Scientist", "DevOps Engineer", "Machine Learning Engineer",
+           "Full-Stack Developer", "Site Reliability Engineer", "Data Engineer", "Software Architect"]
+_COMPANIES = ["Atlas Systems", "Sahara Analytics", "Medina Cloud", "Orion Fintech", "Cedar Health",
+              "Nova Logistics", "Argan Labs", "Blue Coast Retail"]
+_SKILLS = ["Python", "FastAPI", "PostgreSQL", "Docker", "Kubernetes", "Terraform", "AWS", "GCP",
+           "PyTorch", "scikit-learn", "Kafka", "Redis", "React", "TypeScript", "Airflow", "Spark",
+           "LangChain", "CI/CD", "Prometheus", "Grafana"]
+_ACTIONS = ["Designed", "Built", "Led", "Migrated", "Optimized", "Automated", "Scaled", "Introduced"]
+_OBJECTS = ["a payment reconciliation service", "the customer data platform", "real-time fraud scoring",
+            "the internal developer portal", "a recommendation pipeline", "the observability stack",
+            "nightly ETL jobs", "a multi-region deployment"]
+_RESULTS = ["cutting p95 latency by {n}%", "saving {n}k USD per year", "reducing incidents by {n}%",
+            "serving {n}M requests per day", "shortening release cycles by {n}%"]
+
+
+def resume_sections(size: str, seed: int = 0) -> list[tuple[str, list[str]]]:
+    """(heading, lines) sections of a resume; deterministic for (size, seed)."""
+    rng = random.Random(f"{size}-{seed}")
+    name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+    title = rng.choice(_TITLES)
+    skills = rng.sample(_SKILLS, k=min(len(_SKILLS), 6 + SIZES[size] // 2))
+
+    experience = []
+    for i in range(SIZES[size]):
+        start = 2024 - 2 * (i + 1)
+        experience.append(f"{rng.choice(_TITLES)} at {rng.choice(_COMPANIES)} ({start} - {start + 2})")
+        for _ in range(3):
+            result = rng.choice(_RESULTS).format(n=rng.randint(10, 90))
+            experience.append(f"- {rng.choice(_ACTIONS)} {rng.choice(_OBJECTS)} with "
+                              f"{rng.choice(skills)} and {rng.choice(skills)}, {result}.")
+
+    return [
+        (name, [title, f"{name.lower().replace(' ', '.')}@example.com | Casablanca, Morocco"]),
+        ("Summary", [f"{title} with {min(2 * SIZES[size], 20)} years of experience building reliable, "
+                     f"data-intensive systems with {', '.join(skills[:3])}."]),
+        ("Skills", [", ".join(skills)]),
+        ("Experience", experience),
+        ("Education", ["MSc Computer Science, Mohammed V University (2012)"]),
+    ]
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, sections: list[tuple[str, list[str]]], lines_per_page: int = 50) -> None:
+    lines = []
+    for heading, body in sections:
+        lines.append(heading.upper())
+        for line in body:
+            lines.extend(textwrap.wrap(line, width=95) or [""])
+        lines.append("")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then (page, content) pairs
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>",
+               3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"}
+    page_ids = []
+    for index, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * index, 5 + 2 * index
+        page_ids.append(page_id)
+        text = "\n".join(f"({_pdf_escape(line)}) Tj T*" for line in page_lines)
+        stream = f"BT /F1 10 Tf 14 TL 50 790 Td\n{text}\nET"
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        objects[content_id] = f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(output)
+        output += f"{object_id} 0 obj\n{objects[object_id]}\nendobj\n".encode("latin-1")
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for object_id in sorted(objects):
+        output += f"{offsets[object_id]:010d} 00000 n \n".encode("latin-1")
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("latin-1")
+
+    with open(path, "wb") as f:
+        f.write(output)
+
+
+def write_docx(path: str, sections: list[tuple[str, list[str]]]) -> None:
+    document = DocxDocument()
+    for index, (heading, body) in enumerate(sections):
+        document.add_heading(heading, level=0 if index == 0 else 1)
+        for line in body:
+            document.add_paragraph(line)
+    document.save(path)
+
+
+def write_html(path: str, sections: list[tuple[str, list[str]]]) -> None:
+    parts = ["<!DOCTYPE html>", "<html><head><meta charset=\"utf-8\"><title>Resume</title></head><body>"]
+    for index, (heading, body) in enumerate(sections):
+        tag = "h1" if index == 0 else "h2"
+        parts.append(f"<{tag}>{html.escape(heading)}</{tag}>")
+        parts.extend(f"<p>{html.escape(line)}</p>" for line in body)
+    parts.append("</body></html>")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx, "html": write_html}
+
+
+def generate_resume(directory: str, file_format: str, size: str, seed: int = 0) -> str:
+    """Write one synthetic resume and return its path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"resume_{size}_{seed}.{file_format}")
+    WRITERS[file_format](path, resume_sections(size, seed))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for file_format in args.formats:
+        for size in args.sizes:
+            print(generate_resume(args.out, file_format, size, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,35 @@
 from fastapi import FastAPI
+from api.core.logging_config import setup_logging
+
+# Before the API modules are imported, so their import-time logs are queued too
+setup_logging()
+
 from api.utils.init_db import create_tables
 from api.routes.Authentication  import auth_router
 from api.routes.Resume import resume_router
-from api.core.middlewares import AuthMiddleware
+from api.routes.Metrics import metrics_router
+from api.routes.Health import health_router
+from api.core.lifecycle import lifespan
+from api.core.middlewares import AuthMiddleware, ServerTimingMiddleware, BodySizeLimitMiddleware
+from api.services.resume_service import ResumeService
 
 
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+# Room for the multipart boundaries and part headers around the file
+app.add_middleware(BodySizeLimitMiddleware, limits={"/resume/upload": ResumeService.MAX_UPLOAD_BYTES + 64 * 1024})
 app.add_middleware(AuthMiddleware)
+# Added last so it wraps authentication too
+app.add_middleware(ServerTimingMiddleware)
 
 # Initialize the database and create tables
 # create_tables()
 
 app.include_router(auth_router)
 app.include_router(resume_router)
+app.include_router(metrics_router)
+app.include_router(health_router)
 
 
 @app.get("/")
@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# api.core.database builds its engines at import time, so point them at a
+# throwaway SQLite file before any api module is imported.
+_db_dir = tempfile.mkdtemp(prefix="api-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'test.sqlite3')}")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api.core.database import Base, async_database_url, engine_options, get_async_db, log_slow_queries
+from api.models.Applicationlogs import ApplicationLog  # noqa: F401 (registers the mapper)
+from api.models.Resume import Resume
+from api.models.User import User
+from api.repositories.resume_repository import AsyncResumeRepository
+from api.repositories.user_repository import AsyncUserRepository
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'repo.sqlite3'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    yield async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def make_user(name: str) -> User:
+    return User(username=name, email=f"{name}@example.com", hashed_password="x", full_name=name.title())
+
+
+def test_async_database_url_switches_to_async_drivers():
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert async_database_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert async_database_url("postgresql+psycopg2://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert async_database_url("sqlite+aiosqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+
+
+def test_engine_options_skip_pool_settings_for_sqlite():
+    assert "pool_size" not in engine_options("sqlite:///./app.db")
+    options = engine_options("postgresql+asyncpg://u:p@db/app", pool_size=8, max_overflow=3)
+    assert (options["pool_size"], options["max_overflow"]) == (8, 3)
+
+
+def test_get_async_db_yields_a_usable_session():
+    async def run():
+        dependency = get_async_db()
+        db = await anext(dependency)
+        try:
+            assert isinstance(db, AsyncSession)
+            assert (await db.execute(text("SELECT 1"))).scalar() == 1
+        finally:
+            await dependency.aclose()
+
+    asyncio.run(run())
+
+
+def test_user_repository_create_and_lookup(session_factory):
+    async def run():
+        async with session_factory() as db:
+            repository = AsyncUserRepository(db)
+            created = await repository.create_user(make_user("alice"))
+            await repository.create_user(make_user("bob"))
+            assert created.id is not None
+
+        async with session_factory() as db:
+            repository = AsyncUserRepository(db)
+            found = await repository.get_user_by_email("alice@example.com")
+            assert found is not None and found.id == created.id
+            assert await repository.get_user_by_email("nobody@example.com") is None
+            assert {user.username for user in await repository.get_all_users()} == {"alice", "bob"}
+
+    asyncio.run(run())
+
+
+def test_resume_repository_crud(session_factory):
+    async def run():
+        async with session_factory() as db:
+            user = await AsyncUserRepository(db).create_user(make_user("carol"))
+            repository = AsyncResumeRepository(db)
+            resume = await repository.create_resume(
+                Resume(user_id=user.id, filename="cv.pdf", upload_timestamp=datetime.now())
+            )
+
+            updated = await repository.update_resume(resume.id, {"filename": "cv-v2.pdf"})
+            assert updated.filename == "cv-v2.pdf"
+            assert [r.id for r in await repository.get_resumes_by_user_id(user.id)] == [resume.id]
+            assert len(await repository.get_all_resumes()) == 1
+
+            await repository.delete_resume(resume.id)
+            assert await repository.get_resume_by_id(resume.id) is None
+            with pytest.raises(ValueError):
+                await repository.delete_resume(resume.id)
+            with pytest.raises(ValueError):
+                await repository.update_resume(resume.id, {"filename": "x"})
+
+    asyncio.run(run())
+
+
+def test_slow_query_timer_is_dropped_when_a_statement_fails(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.sqlite3'}")
+    log_slow_queries(engine, threshold_ms=1000)
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info.get("query_started") == []
+    engine.dispose()